@@ -1,15 +1,21 @@
 import logging
-import os
+import re
+from collections.abc import Mapping
+from types import MappingProxyType
 from typing import Any, Literal
 
 import numpy as np
+import torch
 
-from tts_engine_base import TTSEngineBase
+from tts_engine_base import DEFAULT_SPEAKER_CACHE_DIR, TTSEngineBase
 
 logger = logging.getLogger("voice_cloner.chatterbox")
 
 ChatterboxVariant = Literal["turbo", "standard"]
 
+# Matches paralinguistic tags such as [laugh]; validate_text() runs on every GUI edit
+_TAG_RE = re.compile(r"\[(\w+)\]")
+
 
 class ChatterboxEngine(TTSEngineBase):
     """TTS engine using Chatterbox by Resemble AI."""
@@ -17,37 +23,119 @@ class ChatterboxEngine(TTSEngineBase):
     # Languages supported by multilingual features (when available)
     SUPPORTED_LANGUAGES = ["en"]  # Base Chatterbox is English-focused
 
+    name = "Chatterbox"  # Replaced per instance with the variant's name
+    supports_languages = SUPPORTED_LANGUAGES
+    VARIANT_NAMES = {"turbo": "Chatterbox Turbo (350M)", "standard": "Chatterbox Standard (500M)"}
+
     # Paralinguistic tags supported by Turbo variant
     PARALINGUISTIC_TAGS = ["laugh", "chuckle", "cough", "sigh", "gasp", "yawn"]
-
-    def __init__(self, speaker_wav: str, device: str | None = None, variant: ChatterboxVariant = "turbo"):
-        super().__init__(speaker_wav, device)
+    _PARALINGUISTIC_TAG_SET = frozenset(PARALINGUISTIC_TAGS)
+
+    # Read-only, so get_supported_parameters() can hand out the same object every call
+    _PARAM_SPEC = MappingProxyType(
+        {
+            "cfg_weight": MappingProxyType(
+                {
+                    "type": float,
+                    "default": 0.5,
+                    "description": "CFG weight - controls text adherence (0.0-1.0). Lower for fast speakers.",
+                    "min": 0.0,
+                    "max": 1.0,
+                }
+            ),
+            "exaggeration": MappingProxyType(
+                {
+                    "type": float,
+                    "default": 0.5,
+                    "description": "Expressiveness level (0.0-1.5). Higher = more dramatic.",
+                    "min": 0.0,
+                    "max": 1.5,
+                }
+            ),
+        }
+    )
+
+    def __init__(
+        self,
+        speaker_wav: str,
+        device: str | None = None,
+        variant: ChatterboxVariant = "turbo",
+        compile_model: bool = False,
+        compile_mode: str = "default",
+        quantize: bool = False,
+        precision: str | torch.dtype = "fp32",
+        cpu_threads: int | None = None,
+        warmup: bool = True,
+        speaker_cache_capacity: int = 50,
+        speaker_cache_dir: str | None = DEFAULT_SPEAKER_CACHE_DIR,
+    ):
+        super().__init__(
+            speaker_wav,
+            device,
+            compile_model=compile_model,
+            compile_mode=compile_mode,
+            quantize=quantize,
+            precision=precision,
+            cpu_threads=cpu_threads,
+            warmup=warmup,
+            speaker_cache_capacity=speaker_cache_capacity,
+            speaker_cache_dir=speaker_cache_dir,
+        )
         self.variant = variant
-        self._model = None  # Lazy loading
-        self._sample_rate = None
-
-    @property
-    def model(self):
-        """Lazy load model on first use."""
-        if self._model is None:
-            logger.info(f"Loading Chatterbox {self.variant} model...")
-            try:
-                from chatterbox.tts import ChatterboxTTS
-
-                self._model = ChatterboxTTS.from_pretrained(device=self.device)
-                self._sample_rate = self._model.sr
-                logger.info(f"Chatterbox {self.variant} model loaded successfully")
-            except ImportError as e:
-                logger.error("chatterbox-tts package not installed. " "Install with: pip install chatterbox-tts")
-                raise ImportError("chatterbox-tts package required. Install with: pip install chatterbox-tts") from e
-        return self._model
+        self.name = self.VARIANT_NAMES.get(variant, "Chatterbox")
+
+    def _model_key(self) -> tuple:
+        return (self.variant,)
+
+    def _load_model(self):
+        """Load, freeze and optionally quantize and compile a Chatterbox model."""
+        logger.info(f"Loading Chatterbox {self.variant} model...")
+        try:
+            from chatterbox.tts import ChatterboxTTS
+        except ImportError as e:
+            logger.error("chatterbox-tts package not installed. " "Install with: pip install chatterbox-tts")
+            raise ImportError("chatterbox-tts package required. Install with: pip install chatterbox-tts") from e
+
+        # from_pretrained() reads the safetensors checkpoints on CPU and moves each module to the device
+        model = ChatterboxTTS.from_pretrained(device=self.device)
+        if self.device == "cuda":
+            torch.cuda.empty_cache()
+        self._remove_weight_norm(model.s3gen)
+        self._freeze(model.t3, model.s3gen, model.ve)
+        # Under reduced precision, only T3 runs in autocast; S3Gen's flow/vocoder stays fp32
+        self._run_in_fp32(model.s3gen, "inference")
+        # Autoregressive decoding is bound by T3 weight reads; int8 Linears cut them 4x
+        model.t3 = self._quantize(model.t3)
+        # The T3 Llama backbone runs once per decoded speech token
+        model.t3.tfmr = self._compile(model.t3.tfmr)
+        logger.info(f"Chatterbox {self.variant} model loaded successfully")
+        return model
 
     @property
     def sample_rate(self) -> int:
         """Get the model's sample rate."""
-        if self._sample_rate is None:
-            _ = self.model  # Trigger lazy load
-        return self._sample_rate
+        return self.model.sr
+
+    def prepare_speaker(self):
+        """Compute the Chatterbox conditionals for speaker_wav, then warm up."""
+        model = self.model  # Load outside inference mode
+        with self._model_lock(), torch.inference_mode():
+            model.conds = self._get_speaker_latents(variant=self.variant)
+        self._warmup()
+
+    def _compute_speaker_latents(self, **params):
+        """Run the Chatterbox voice encoder and speech tokenizer over the reference audio."""
+        # Exaggeration is left at its default; generate() re-applies the requested value
+        self.model.prepare_conditionals(self.speaker_wav)
+        return self.model.conds
+
+    def _write_speaker_latents(self, latents, path: str):
+        latents.save(path)
+
+    def _read_speaker_latents(self, path: str):
+        from chatterbox.tts import Conditionals
+
+        return Conditionals.load(path, map_location=self.device).to(self.device)
 
     def generate(
         self, text: str, language: str = "en", cfg_weight: float = 0.5, exaggeration: float = 0.5, **kwargs
@@ -64,50 +152,19 @@ class ChatterboxEngine(TTSEngineBase):
         Returns:
             Tuple of (audio_data, sample_rate)
         """
-        # Validate reference audio exists
-        if not os.path.exists(self.speaker_wav):
-            raise FileNotFoundError(f"Speaker reference file not found: {self.speaker_wav}")
-
-        # Generate audio
-        wav_tensor = self.model.generate(
-            text,
-            audio_prompt_path=self.speaker_wav,
-            cfg_weight=cfg_weight,
-            exaggeration=exaggeration,
-        )
+        model = self.model  # Load outside inference mode
 
-        # Convert tensor to numpy array
-        audio_data = wav_tensor.squeeze().cpu().numpy().astype(np.float32)
-
-        return audio_data, self.sample_rate
-
-    def get_supported_parameters(self) -> dict[str, dict[str, Any]]:
-        params = {
-            "cfg_weight": {
-                "type": float,
-                "default": 0.5,
-                "description": "CFG weight - controls text adherence (0.0-1.0). Lower for fast speakers.",
-                "min": 0.0,
-                "max": 1.0,
-            },
-            "exaggeration": {
-                "type": float,
-                "default": 0.5,
-                "description": "Expressiveness level (0.0-1.5). Higher = more dramatic.",
-                "min": 0.0,
-                "max": 1.5,
-            },
-        }
-        return params
+        # Generate audio from the cached conditionals; generate() re-applies exaggeration itself.
+        # The conditionals live on the shared model, so other engines' speakers wait until this one is done
+        with self._model_lock(), torch.inference_mode():
+            model.conds = self._get_speaker_latents(variant=self.variant)
+            with self._autocast():
+                wav_tensor = model.generate(text, cfg_weight=cfg_weight, exaggeration=exaggeration)
 
-    @property
-    def name(self) -> str:
-        variant_names = {"turbo": "Chatterbox Turbo (350M)", "standard": "Chatterbox Standard (500M)"}
-        return variant_names.get(self.variant, "Chatterbox")
+        return self._to_numpy(wav_tensor), self.sample_rate
 
-    @property
-    def supports_languages(self) -> list[str]:
-        return self.SUPPORTED_LANGUAGES
+    def get_supported_parameters(self) -> Mapping[str, Mapping[str, Any]]:
+        return self._PARAM_SPEC
 
     @property
     def supports_paralinguistic_tags(self) -> bool:
@@ -127,13 +184,11 @@ class ChatterboxEngine(TTSEngineBase):
         Returns:
             Tuple of (is_valid, message)
         """
-        import re
-
         if not text.strip():
             return False, "Text cannot be empty"
 
         # Check for paralinguistic tags in non-Turbo variants
-        tags_found = re.findall(r"\[(\w+)\]", text)
+        tags_found = _TAG_RE.findall(text)
         if tags_found and not self.supports_paralinguistic_tags:
             return False, (
                 f"Paralinguistic tags {tags_found} are only supported in Turbo variant. "
@@ -142,7 +197,7 @@ class ChatterboxEngine(TTSEngineBase):
 
         # Validate tags are recognized
         if tags_found and self.supports_paralinguistic_tags:
-            invalid_tags = [t for t in tags_found if t not in self.PARALINGUISTIC_TAGS]
+            invalid_tags = [t for t in tags_found if t not in self._PARALINGUISTIC_TAG_SET]
             if invalid_tags:
                 return False, (f"Unknown tags: {invalid_tags}. " f"Supported: {self.PARALINGUISTIC_TAGS}")
 
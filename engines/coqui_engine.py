@@ -1,21 +1,32 @@
 import logging
-import os
-import tempfile
+from collections.abc import Iterator, Mapping
+from types import MappingProxyType
 from typing import Any
 
 import numpy as np
-import soundfile as sf
+import torch
 
-from tts_engine_base import TTSEngineBase
+from tts_engine_base import DEFAULT_SPEAKER_CACHE_DIR, TTSEngineBase
 
 logger = logging.getLogger("voice_cloner.coqui")
 
+# XTTS's GPT emits one audio code per 1024 input samples at 22.05 kHz
+_XTTS_CODES_PER_SECOND = 22050 / 1024
 
-def _ensure_mono(audio_data: np.ndarray) -> np.ndarray:
-    """Ensure audio is mono (1D array)."""
-    if len(audio_data.shape) > 1:
-        return audio_data.mean(axis=1)
-    return audio_data
+
+def _conv1d_to_linear(module: torch.nn.Module):
+    """Replace GPT-2 Conv1D layers (Linears with a transposed weight) with nn.Linear, in place."""
+    from transformers.pytorch_utils import Conv1D
+
+    for parent in list(module.modules()):
+        for name, child in parent.named_children():
+            if isinstance(child, Conv1D):
+                in_features, out_features = child.weight.shape
+                linear = torch.nn.Linear(in_features, out_features, device=child.weight.device)
+                with torch.no_grad():
+                    linear.weight.copy_(child.weight.t())
+                    linear.bias.copy_(child.bias)
+                setattr(parent, name, linear.requires_grad_(False))
 
 
 class CoquiEngine(TTSEngineBase):
@@ -39,30 +50,147 @@ class CoquiEngine(TTSEngineBase):
         "hu",
         "ko",
     ]
+    _SUPPORTED_LANGUAGES_SET = frozenset(SUPPORTED_LANGUAGES)
+
+    name = "Coqui XTTS v2"
+    supports_languages = SUPPORTED_LANGUAGES
+
+    # Read-only, so get_supported_parameters() can hand out the same object every call
+    _PARAM_SPEC = MappingProxyType(
+        {
+            "language": MappingProxyType(
+                {
+                    "type": str,
+                    "default": "en",
+                    "description": "Language code (en, es, fr, de, etc.)",
+                    "options": tuple(SUPPORTED_LANGUAGES),
+                }
+            ),
+            "temperature": MappingProxyType(
+                {
+                    "type": float,
+                    "default": 0.7,
+                    "description": "Sampling temperature (0.1-1.0)",
+                    "min": 0.1,
+                    "max": 1.0,
+                }
+            ),
+            "gpt_cond_len": MappingProxyType(
+                {
+                    "type": int,
+                    "default": 128,
+                    "description": "GPT conditioning length",
+                    "min": 32,
+                    "max": 256,
+                }
+            ),
+        }
+    )
 
     def __init__(
         self,
         speaker_wav: str,
         device: str | None = None,
         model_name: str = "tts_models/multilingual/multi-dataset/xtts_v2",
+        compile_model: bool = False,
+        compile_mode: str = "default",
+        quantize: bool = False,
+        precision: str | torch.dtype = "fp32",
+        cpu_threads: int | None = None,
+        warmup: bool = True,
+        speaker_cache_capacity: int = 50,
+        speaker_cache_dir: str | None = DEFAULT_SPEAKER_CACHE_DIR,
     ):
-        super().__init__(speaker_wav, device)
+        super().__init__(
+            speaker_wav,
+            device,
+            compile_model=compile_model,
+            compile_mode=compile_mode,
+            quantize=quantize,
+            precision=precision,
+            cpu_threads=cpu_threads,
+            warmup=warmup,
+            speaker_cache_capacity=speaker_cache_capacity,
+            speaker_cache_dir=speaker_cache_dir,
+        )
         self.model_name = model_name
-        self._tts = None  # Lazy loading
 
     @property
     def tts(self):
-        """Lazy load TTS model on first use."""
-        if self._tts is None:
-            from TTS.api import TTS
+        """The Coqui TTS API object, loaded on first use."""
+        return self.model
+
+    def _model_key(self) -> tuple:
+        return (self.model_name,)
+
+    def _load_model(self):
+        """Load, freeze and optionally quantize and compile a Coqui TTS model."""
+        from TTS.api import TTS
+
+        logger.info(f"Loading Coqui TTS model: {self.model_name}")
+        # Build on CPU and move once, so checkpoint buffers never sit on the GPU next to the weights
+        tts = TTS(model_name=self.model_name, progress_bar=False).to(self.device)
+        if self.device == "cuda":
+            torch.cuda.empty_cache()
+        tts_model = tts.synthesizer.tts_model
+        if hasattr(tts_model, "hifigan_decoder"):
+            self._remove_weight_norm(tts_model.hifigan_decoder)
+        self._freeze(tts_model)
+        if hasattr(tts_model, "gpt"):
+            # Autoregressive decoding is bound by GPT weight reads; int8 Linears cut them 4x
+            if self.quantize and self.device == "cpu":
+                _conv1d_to_linear(tts_model.gpt)  # GPT-2 keeps its projections in Conv1D layers
+            tts_model.gpt = self._quantize(tts_model.gpt)
+            # The GPT-2 backbone runs once per decoded audio code
+            gpt_inference = getattr(tts_model.gpt, "gpt_inference", None)
+            if gpt_inference is not None:
+                gpt_inference.transformer = self._compile(gpt_inference.transformer)
+        if hasattr(tts_model, "hifigan_decoder"):
+            # Under reduced precision, only the GPT runs in autocast; the vocoder stays fp32
+            self._run_in_fp32(tts_model.hifigan_decoder)
+            tts_model.hifigan_decoder = self._compile(tts_model.hifigan_decoder)
+        logger.info("Coqui TTS model loaded successfully")
+        return tts
+
+    def prepare_speaker(self):
+        """Compute the XTTS latents for speaker_wav with the default conditioning length, then warm up."""
+        if hasattr(self.tts.synthesizer.tts_model, "get_conditioning_latents"):
+            with torch.inference_mode():
+                self._get_speaker_latents(
+                    model_name=self.model_name, gpt_cond_len=self._PARAM_SPEC["gpt_cond_len"]["default"]
+                )
+        self._warmup()
 
-            logger.info(f"Loading Coqui TTS model: {self.model_name}")
-            self._tts = TTS(model_name=self.model_name, progress_bar=False, gpu=(self.device == "cuda"))
-            logger.info("Coqui TTS model loaded successfully")
-        return self._tts
+    def _compute_speaker_latents(self, gpt_cond_len: int, **params):
+        """Run the XTTS speaker encoder over the reference audio."""
+        tts_model = self.tts.synthesizer.tts_model
+        config = tts_model.config
+        return tts_model.get_conditioning_latents(
+            audio_path=self.speaker_wav,
+            gpt_cond_len=gpt_cond_len,
+            gpt_cond_chunk_len=config.gpt_cond_chunk_len,
+            max_ref_length=config.max_ref_len,
+            sound_norm_refs=config.sound_norm_refs,
+        )
+
+    def _check_language(self, language: str):
+        """Reject language codes XTTS cannot synthesize before running inference."""
+        if language not in self._SUPPORTED_LANGUAGES_SET:
+            raise ValueError(f"Unsupported language '{language}'. Supported: {self.SUPPORTED_LANGUAGES}")
+
+    @property
+    def supports_speed(self) -> bool:
+        """XTTS changes tempo natively by stretching its GPT latents before vocoding."""
+        return hasattr(self.tts.synthesizer.tts_model, "get_conditioning_latents")
 
     def generate(
-        self, text: str, language: str = "en", temperature: float = 0.7, gpt_cond_len: int = 128, **kwargs
+        self,
+        text: str,
+        language: str = "en",
+        temperature: float = 0.7,
+        gpt_cond_len: int = 128,
+        speed: float = 1.0,
+        **kwargs,
     ) -> tuple[np.ndarray, int]:
         """
         Generate audio using Coqui TTS.
@@ -72,58 +200,133 @@ class CoquiEngine(TTSEngineBase):
             language: Language code.
             temperature: Sampling temperature (0.1-1.0).
             gpt_cond_len: GPT conditioning length.
+            speed: Speech tempo multiplier (XTTS only), applied without changing pitch.
 
         Returns:
             Tuple of (audio_data, sample_rate)
         """
-        # Create temp file for output using mkstemp for better cross-platform support
-        fd, temp_path = tempfile.mkstemp(suffix=".wav")
-        os.close(fd)  # Close file descriptor immediately
-
-        try:
-            self.tts.tts_to_file(
-                text=text,
-                speaker_wav=self.speaker_wav,
-                file_path=temp_path,
-                language=language,
-                gpt_cond_len=gpt_cond_len,
-                temperature=temperature,
+        tts_model = self.tts.synthesizer.tts_model  # Load outside inference mode
+
+        with torch.inference_mode():
+            # XTTS: reuse cached speaker latents instead of re-encoding the reference every call
+            if hasattr(tts_model, "get_conditioning_latents"):
+                self._check_language(language)
+                # Encoded outside autocast, so cached latents are the same at every precision
+                gpt_cond_latent, speaker_embedding = self._get_speaker_latents(
+                    model_name=self.model_name, gpt_cond_len=gpt_cond_len
+                )
+                config = tts_model.config
+                with self._autocast():
+                    out = tts_model.inference(
+                        text,
+                        language,
+                        gpt_cond_latent,
+                        speaker_embedding,
+                        temperature=temperature,
+                        length_penalty=config.length_penalty,
+                        repetition_penalty=config.repetition_penalty,
+                        top_k=config.top_k,
+                        top_p=config.top_p,
+                        speed=speed,
+                        enable_text_splitting=True,
+                    )
+                wav = out["wav"]
+            else:
+                # Other Coqui models: synthesize straight to memory instead of round-tripping a temp WAV
+                with self._autocast():
+                    wav = self.tts.tts(
+                        text=text,
+                        speaker_wav=self.speaker_wav,
+                        language=language,
+                        gpt_cond_len=gpt_cond_len,
+                        temperature=temperature,
+                    )
+
+        audio_data = np.asarray(wav, dtype=np.float32)
+        if audio_data.ndim > 1:
+            # The engine declares mono output (channels = 1); downmix if a model ever breaks that
+            audio_data = audio_data.mean(axis=1, dtype=np.float32)
+        return audio_data, self.tts.synthesizer.output_sample_rate
+
+    def generate_stream(
+        self,
+        text: str,
+        language: str = "en",
+        temperature: float = 0.7,
+        gpt_cond_len: int = 128,
+        speed: float = 1.0,
+        chunk_seconds: float = 1.0,
+        **kwargs,
+    ) -> Iterator[tuple[np.ndarray, int]]:
+        """
+        Generate audio using Coqui TTS, yielding chunks as XTTS decodes them.
+
+        XTTS cross-fades consecutive chunks itself, so they can be written back to back.
+        Models without incremental decoding yield the full clip as one chunk.
+
+        Args:
+            text: Text to synthesize.
+            language: Language code.
+            temperature: Sampling temperature (0.1-1.0).
+            gpt_cond_len: GPT conditioning length.
+            speed: Speech tempo multiplier, applied without changing pitch.
+            chunk_seconds: Approximate audio length per chunk. Smaller chunks start playback
+                           sooner; larger ones decode more efficiently.
+
+        Yields:
+            Tuples of (audio_chunk, sample_rate)
+        """
+        tts_model = self.tts.synthesizer.tts_model  # Load outside inference mode
+        if not hasattr(tts_model, "inference_stream"):
+            yield from super().generate_stream(
+                text, language=language, temperature=temperature, gpt_cond_len=gpt_cond_len
             )
-            audio_data, sample_rate = sf.read(temp_path)
-            audio_data = _ensure_mono(audio_data)
-            return audio_data.astype(np.float32), sample_rate
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-
-    def get_supported_parameters(self) -> dict[str, dict[str, Any]]:
-        return {
-            "language": {
-                "type": str,
-                "default": "en",
-                "description": "Language code (en, es, fr, de, etc.)",
-                "options": self.SUPPORTED_LANGUAGES,
-            },
-            "temperature": {
-                "type": float,
-                "default": 0.7,
-                "description": "Sampling temperature (0.1-1.0)",
-                "min": 0.1,
-                "max": 1.0,
-            },
-            "gpt_cond_len": {
-                "type": int,
-                "default": 128,
-                "description": "GPT conditioning length",
-                "min": 32,
-                "max": 256,
-            },
-        }
+            return
 
-    @property
-    def name(self) -> str:
-        return "Coqui XTTS v2"
+        self._check_language(language)
+        sample_rate = self.tts.synthesizer.output_sample_rate
+        stream_chunk_size = max(1, round(chunk_seconds * _XTTS_CODES_PER_SECOND))
+        chunks = self._inference_stream(tts_model, text, language, temperature, gpt_cond_len, speed, stream_chunk_size)
+        for chunk in chunks:
+            yield self._to_numpy(chunk), sample_rate
 
-    @property
-    def supports_languages(self) -> list[str]:
-        return self.SUPPORTED_LANGUAGES
+    @torch.inference_mode()
+    def _inference_stream(
+        self,
+        tts_model,
+        text: str,
+        language: str,
+        temperature: float,
+        gpt_cond_len: int,
+        speed: float,
+        stream_chunk_size: int,
+    ):
+        # The decorator (unlike a with-block) keeps inference mode from leaking into the caller between yields
+        gpt_cond_latent, speaker_embedding = self._get_speaker_latents(
+            model_name=self.model_name, gpt_cond_len=gpt_cond_len
+        )
+        config = tts_model.config
+        chunks = tts_model.inference_stream(
+            text,
+            language,
+            gpt_cond_latent,
+            speaker_embedding,
+            temperature=temperature,
+            length_penalty=config.length_penalty,
+            repetition_penalty=config.repetition_penalty,
+            top_k=config.top_k,
+            top_p=config.top_p,
+            speed=speed,
+            stream_chunk_size=stream_chunk_size,
+            enable_text_splitting=True,
+        )
+        # Enter autocast per chunk so it is not left active in the caller between yields
+        while True:
+            with self._autocast():
+                chunk = next(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+
+    def get_supported_parameters(self) -> Mapping[str, Mapping[str, Any]]:
+        return self._PARAM_SPEC
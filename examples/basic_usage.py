@@ -24,15 +24,15 @@ def main():
         "VoiceCloner can clone any voice from a short audio sample.",
     ]
 
-    for i, text in enumerate(texts):
-        print(f"\nGenerating speech {i + 1}: '{text[:50]}...'")
-        cloner.say(
-            text,
-            language="en",
-            play_audio=True,
-            save_audio=True,
-            output_file=f"./output-examples/basic_demo_{i + 1}.wav",
-        )
+    # Generate all texts in one call so the model and speaker conditioning are reused
+    print(f"\nGenerating speech for {len(texts)} texts...")
+    cloner.say_batch(
+        texts,
+        language="en",
+        play_audio=True,
+        save_audio=True,
+        output_files=[f"./output-examples/basic_demo_{i + 1}.wav" for i in range(len(texts))],
+    )
 
     print("\nDone! Check output-examples/ for generated audio files.")
 
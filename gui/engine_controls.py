@@ -1,6 +1,6 @@
 from typing import Any
 
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtWidgets import (
     QComboBox,
     QGroupBox,
@@ -19,6 +19,31 @@ class EngineControlsBase(QWidget):
 
     parameters_changed = Signal(dict)
 
+    # A slider drag fires valueChanged many times a second; emit once it settles
+    _DEBOUNCE_MS = 50
+
+    def __init__(self):
+        super().__init__()
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self._DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._emit_parameters)
+
+    def _on_param_changed(self):
+        self._debounce.start()
+
+    def _emit_parameters(self):
+        self.parameters_changed.emit(self.get_parameters())
+
+    def _connect_slider(self, slider: QSlider, label: QLabel):
+        """Keep the slider's value label current and schedule a parameters_changed emission."""
+
+        def on_value_changed(value: int):
+            label.setText(f"{value/100:.2f}")
+            self._debounce.start()
+
+        slider.valueChanged.connect(on_value_changed)
+
     def get_parameters(self) -> dict[str, Any]:
         """Return current parameter values."""
         raise NotImplementedError
@@ -58,8 +83,12 @@ class CoquiControls(EngineControlsBase):
         lang_layout = QHBoxLayout()
         lang_layout.addWidget(QLabel("Language:"))
         self.lang_combo = QComboBox()
-        for display_name, code in self.LANGUAGES:
-            self.lang_combo.addItem(display_name, code)
+        # Populate in one batch with signals blocked, then connect
+        self.lang_combo.blockSignals(True)
+        self.lang_combo.addItems([display_name for display_name, _ in self.LANGUAGES])
+        for index, (_, code) in enumerate(self.LANGUAGES):
+            self.lang_combo.setItemData(index, code)
+        self.lang_combo.blockSignals(False)
         self.lang_combo.currentIndexChanged.connect(self._on_param_changed)
         lang_layout.addWidget(self.lang_combo)
         lang_layout.addStretch()
@@ -71,9 +100,8 @@ class CoquiControls(EngineControlsBase):
         self.temp_slider = QSlider(Qt.Horizontal)
         self.temp_slider.setRange(10, 100)  # 0.1 to 1.0
         self.temp_slider.setValue(70)
-        self.temp_slider.valueChanged.connect(self._on_param_changed)
         self.temp_label = QLabel("0.70")
-        self.temp_slider.valueChanged.connect(lambda v: self.temp_label.setText(f"{v/100:.2f}"))
+        self._connect_slider(self.temp_slider, self.temp_label)
         temp_layout.addWidget(self.temp_slider)
         temp_layout.addWidget(self.temp_label)
         temp_group.setLayout(temp_layout)
@@ -81,9 +109,6 @@ class CoquiControls(EngineControlsBase):
 
         self.setLayout(layout)
 
-    def _on_param_changed(self):
-        self.parameters_changed.emit(self.get_parameters())
-
     def get_parameters(self) -> dict[str, Any]:
         return {
             "language": self.lang_combo.currentData(),
@@ -111,9 +136,8 @@ class ChatterboxControls(EngineControlsBase):
         self.cfg_slider = QSlider(Qt.Horizontal)
         self.cfg_slider.setRange(0, 100)  # 0.0 to 1.0
         self.cfg_slider.setValue(50)
-        self.cfg_slider.valueChanged.connect(self._on_param_changed)
         self.cfg_label = QLabel("0.50")
-        self.cfg_slider.valueChanged.connect(lambda v: self.cfg_label.setText(f"{v/100:.2f}"))
+        self._connect_slider(self.cfg_slider, self.cfg_label)
         cfg_layout.addWidget(QLabel("Less"))
         cfg_layout.addWidget(self.cfg_slider)
         cfg_layout.addWidget(QLabel("More"))
@@ -127,9 +151,8 @@ class ChatterboxControls(EngineControlsBase):
         self.exag_slider = QSlider(Qt.Horizontal)
         self.exag_slider.setRange(0, 150)  # 0.0 to 1.5
         self.exag_slider.setValue(50)
-        self.exag_slider.valueChanged.connect(self._on_param_changed)
         self.exag_label = QLabel("0.50")
-        self.exag_slider.valueChanged.connect(lambda v: self.exag_label.setText(f"{v/100:.2f}"))
+        self._connect_slider(self.exag_slider, self.exag_label)
         exag_layout.addWidget(QLabel("Subtle"))
         exag_layout.addWidget(self.exag_slider)
         exag_layout.addWidget(QLabel("Dramatic"))
@@ -148,9 +171,6 @@ class ChatterboxControls(EngineControlsBase):
 
         self.setLayout(layout)
 
-    def _on_param_changed(self):
-        self.parameters_changed.emit(self.get_parameters())
-
     def _show_tags_help(self):
         tags_text = ", ".join([f"[{tag}]" for tag in self.PARALINGUISTIC_TAGS])
         QMessageBox.information(
@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+import torch
+
+from tts_engine_base import TTSEngineBase
+
+
+class CountingEngine(TTSEngineBase):
+    """Engine without a model; its speaker 'encoder' counts calls and returns a tensor."""
+
+    name = "Counting"
+    supports_languages = ["en"]
+
+    def __init__(self, speaker_wav: str, **kwargs):
+        super().__init__(speaker_wav, device="cpu", **kwargs)
+        self.computed = 0
+
+    def _compute_speaker_latents(self, **params):
+        self.computed += 1
+        with open(self.speaker_wav, "rb") as f:
+            return torch.tensor(list(f.read()), dtype=torch.float32)
+
+    def _load_model(self):
+        return torch.nn.Identity()
+
+    def generate(self, text: str, language: str = "en", **kwargs):
+        return np.zeros(1, dtype=np.float32), 24000
+
+    def get_supported_parameters(self):
+        return {}
+
+
+@pytest.fixture(autouse=True)
+def empty_speaker_cache():
+    TTSEngineBase._speaker_cache.clear()
+    yield
+    TTSEngineBase._speaker_cache.clear()
+
+
+def write(path, data: bytes) -> str:
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_copy_shares_cache_entry(tmp_path):
+    engine = CountingEngine(write(tmp_path / "a.wav", b"voice"), speaker_cache_dir=None)
+    first = engine._get_speaker_latents(model_name="m")
+
+    engine.speaker_wav = write(tmp_path / "copy.wav", b"voice")
+    assert torch.equal(engine._get_speaker_latents(model_name="m"), first)
+    assert engine.computed == 1
+
+
+def test_params_are_part_of_the_key(tmp_path):
+    engine = CountingEngine(write(tmp_path / "a.wav", b"voice"), speaker_cache_dir=None)
+    engine._get_speaker_latents(gpt_cond_len=64)
+    engine._get_speaker_latents(gpt_cond_len=128)
+    assert engine.computed == 2
+
+    quantized = CountingEngine(engine.speaker_wav, speaker_cache_dir=None, quantize=True)
+    quantized._get_speaker_latents(gpt_cond_len=64)
+    assert quantized.computed == 1
+
+    half = CountingEngine(engine.speaker_wav, speaker_cache_dir=None, precision="bf16")
+    half._get_speaker_latents(gpt_cond_len=64)
+    assert half.computed == 0
+
+
+def test_edit_invalidates_entry(tmp_path):
+    path = tmp_path / "a.wav"
+    engine = CountingEngine(write(path, b"voice"), speaker_cache_dir=None)
+    engine._get_speaker_latents()
+
+    write(path, b"another voice")
+    assert engine._get_speaker_latents().numel() == len(b"another voice")
+    assert engine.computed == 2
+
+
+def test_capacity_evicts_least_recently_used(tmp_path):
+    engine = CountingEngine(write(tmp_path / "a.wav", b"a"), speaker_cache_capacity=2, speaker_cache_dir=None)
+    engine._get_speaker_latents()
+    for name in ("b", "c"):
+        engine.speaker_wav = write(tmp_path / f"{name}.wav", name.encode())
+        engine._get_speaker_latents()
+    assert engine.computed == 3
+
+    engine.speaker_wav = str(tmp_path / "c.wav")
+    engine._get_speaker_latents()
+    assert engine.computed == 3
+
+    engine.speaker_wav = str(tmp_path / "a.wav")
+    engine._get_speaker_latents()
+    assert engine.computed == 4
+
+
+def test_disk_cache_round_trip(tmp_path):
+    speaker_wav = write(tmp_path / "a.wav", b"voice")
+    cache_dir = str(tmp_path / "speakers")
+    first = CountingEngine(speaker_wav, speaker_cache_dir=cache_dir)._get_speaker_latents(model_name="m")
+
+    TTSEngineBase._speaker_cache.clear()
+    engine = CountingEngine(speaker_wav, speaker_cache_dir=cache_dir)
+    assert torch.equal(engine._get_speaker_latents(model_name="m"), first)
+    assert engine.computed == 0
+
+
+def test_model_shared_until_cleared(tmp_path):
+    speaker_wav = write(tmp_path / "a.wav", b"voice")
+    first, second = CountingEngine(speaker_wav), CountingEngine(speaker_wav)
+    assert first.model is second.model
+    assert CountingEngine(speaker_wav, quantize=True).model is not first.model
+    assert first._model_lock() is second._model_lock()
+
+    CountingEngine.clear_cache()
+    assert CountingEngine(speaker_wav).model is not first.model
@@ -0,0 +1,56 @@
+import sys
+import types
+
+import pytest
+
+from tts_factory import TTSFactory
+
+
+class StubEngine:
+    def __init__(self, speaker_wav: str, device: str | None = None, **kwargs):
+        self.speaker_wav = speaker_wav
+        self.device = device
+        self.kwargs = kwargs
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(TTSFactory, "_registry", dict(TTSFactory._registry))
+    monkeypatch.setattr(TTSFactory, "_display_names", dict(TTSFactory._display_names))
+    monkeypatch.setattr(TTSFactory, "_requirements", dict(TTSFactory._requirements))
+
+
+@pytest.fixture
+def stub_module(monkeypatch):
+    module = types.ModuleType("stub_engines")
+    module.StubEngine = StubEngine
+    monkeypatch.setitem(sys.modules, "stub_engines", module)
+    return module
+
+
+def test_create_resolves_import_path_once(stub_module):
+    TTSFactory.register("stub", "stub_engines:StubEngine", "Stub", variant="fast")
+
+    engine = TTSFactory.create("stub", "voice.wav", device="cpu", variant="slow", extra=1)
+    assert isinstance(engine, StubEngine)
+    assert (engine.speaker_wav, engine.device) == ("voice.wav", "cpu")
+    assert engine.kwargs == {"variant": "slow", "extra": 1}
+    assert TTSFactory._registry["stub"] == (StubEngine, {"variant": "fast"})
+
+
+def test_create_unknown_engine():
+    with pytest.raises(ValueError, match="Unknown engine"):
+        TTSFactory.create("missing", "voice.wav")
+
+
+def test_is_available_checks_requirement_without_importing(monkeypatch):
+    TTSFactory.register("stub", "stub_engines:StubEngine", "Stub", requires="json")
+    TTSFactory.register("needs-missing", "stub_engines:StubEngine", "Stub", requires="no_such_package_xyz")
+    TTSFactory.register("no-requirement", "stub_engines:StubEngine", "Stub")
+
+    assert TTSFactory.is_available("stub")
+    assert not TTSFactory.is_available("needs-missing")
+    assert TTSFactory.is_available("no-requirement")
+    assert not TTSFactory.is_available("unregistered")
+    # Only the requirement is looked up; the engine module is never imported
+    assert "stub_engines" not in sys.modules
@@ -1,10 +1,61 @@
 import os
+import threading
 
 import numpy as np
 import pytest
 import soundfile as sf
 
-from voice_cloner import VoiceCloner
+from tts_engine_base import TTSEngineBase
+from voice_cloner import VoiceCloner, split_sentences
+
+
+class StubEngine(TTSEngineBase):
+    """Engine without a model; each text becomes one sample per character at 10 Hz."""
+
+    name = "Stub"
+    supports_languages = ["en"]
+
+    def generate(self, text: str, language: str = "en", **kwargs):
+        return np.full(len(text), len(text), dtype=np.float32), 10
+
+    def get_supported_parameters(self):
+        return {}
+
+
+class FakeOutputStream:
+    def __init__(self):
+        self.written = []
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def write(self, data):
+        self.written.append(data.copy())
+
+
+@pytest.fixture
+def stub_cloner(tmp_path, monkeypatch):
+    speaker_wav = tmp_path / "speaker.wav"
+    speaker_wav.write_bytes(b"voice")
+    cloner = VoiceCloner(speaker_wav=str(speaker_wav), engine=StubEngine(str(speaker_wav)), show_progress=False)
+    cloner.player = FakeOutputStream()
+    monkeypatch.setattr(cloner, "_output_device", lambda sample_rate, channels: cloner.player)
+    return cloner
+
+
+@pytest.fixture
+def captured_output(stub_cloner, monkeypatch):
+    """Record (audio, sample_rate, output_file) for each clip instead of playing or saving it."""
+    clips = []
+    monkeypatch.setattr(
+        stub_cloner,
+        "_output_audio",
+        lambda audio, sample_rate, play, save, output_file, speed: clips.append((audio, sample_rate, output_file)),
+    )
+    return clips
 
 
 # Fixture for the VoiceCloner instance
@@ -69,3 +120,86 @@ def test_invalid_speaker_file():
 def test_unsupported_language(voice_cloner):
     with pytest.raises((ValueError, RuntimeError)):
         voice_cloner.say("This is a test.", language="xx", play_audio=False)
+
+
+# Test sentence splitting used by say_many
+def test_split_sentences():
+    assert split_sentences(" Hello there. How are you?  Fine! ") == ["Hello there.", "How are you?", "Fine!"]
+    assert split_sentences("   ") == []
+    assert split_sentences("你好。今天好吗？很好！") == ["你好。", "今天好吗？", "很好！"]
+
+
+# Test chunked output: every chunk is played and saved, in order
+def test_output_stream_plays_and_saves_chunks(stub_cloner, tmp_path):
+    output_file = str(tmp_path / "out.wav")
+    chunks = [(np.full(3, 0.25, dtype=np.float32), 10), (np.full(2, -0.5, dtype=np.float32), 10)]
+    stub_cloner._output_stream(iter(chunks), True, True, output_file, 1.0)
+
+    expected = np.concatenate([chunk for chunk, _ in chunks])
+    assert np.array_equal(np.concatenate(stub_cloner.player.written), expected)
+    saved, sample_rate = sf.read(output_file, dtype="float32")
+    assert sample_rate == 10
+    assert np.allclose(saved, expected, atol=1e-4)
+
+
+# Test that setting stop_event ends playback and saving at the next chunk
+def test_output_stream_stops_at_next_chunk(stub_cloner, tmp_path):
+    output_file = str(tmp_path / "out.wav")
+    stop_event = threading.Event()
+
+    def chunks():
+        yield np.ones(3, dtype=np.float32) / 2, 10
+        stop_event.set()
+        yield np.ones(4, dtype=np.float32), 10
+
+    stub_cloner._output_stream(chunks(), True, True, output_file, 1.0, stop_event)
+
+    assert sum(len(data) for data in stub_cloner.player.written) == 3
+    assert len(sf.read(output_file)[0]) == 3
+
+
+# Test that say_many joins the sentences with silence into one clip
+def test_say_many_joins_sentences(stub_cloner, captured_output):
+    stub_cloner.say_many("Hi. Hello!", play_audio=False, save_audio=True, output_file="out.wav", pause=0.2)
+
+    [(audio, sample_rate, output_file)] = captured_output
+    assert (sample_rate, output_file) == (10, "out.wav")
+    assert np.array_equal(audio, [3, 3, 3, 0, 0, 6, 6, 6, 6, 6, 6])
+
+
+def test_say_many_rejects_empty_text(stub_cloner):
+    with pytest.raises(ValueError):
+        stub_cloner.say_many(" ", play_audio=False)
+
+
+# Test that say_batch produces one clip per text, each with its own output file
+def test_say_batch_outputs_each_text(stub_cloner, captured_output):
+    stub_cloner.say_batch(["Hi.", "Hello!"], play_audio=False, save_audio=True, output_files=["a.wav", "b.wav"])
+
+    assert [(len(audio), output_file) for audio, _, output_file in captured_output] == [(3, "a.wav"), (6, "b.wav")]
+
+
+def test_say_batch_rejects_mismatched_output_files(stub_cloner):
+    with pytest.raises(ValueError):
+        stub_cloner.say_batch(["Hi.", "Hello!"], play_audio=False, save_audio=True, output_files=["a.wav"])
+
+
+# Test that speed changes go to engines that render them natively
+def test_native_speed(stub_cloner, monkeypatch):
+    engine_kwargs = {}
+    assert stub_cloner._native_speed(1.5, engine_kwargs) == 1.5
+    assert engine_kwargs == {}
+
+    monkeypatch.setattr(StubEngine, "supports_speed", True)
+    assert stub_cloner._native_speed(1.0, engine_kwargs) == 1.0
+    assert engine_kwargs == {}
+    assert stub_cloner._native_speed(1.5, engine_kwargs) == 1.0
+    assert engine_kwargs == {"speed": 1.5}
+
+
+# Test that engines must declare their required class attributes
+def test_engine_requires_class_attributes():
+    with pytest.raises(TypeError, match="supports_languages"):
+
+        class NamedOnly(TTSEngineBase):
+            name = "Named only"
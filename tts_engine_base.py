@@ -1,16 +1,89 @@
+import contextlib
+import functools
+import hashlib
+import logging
+import os
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
 from typing import Any
 
 import numpy as np
 import torch
 
+logger = logging.getLogger("voice_cloner.engine")
+
+_CACHE_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "voice_cloner")
+DEFAULT_SPEAKER_CACHE_DIR = os.path.join(_CACHE_ROOT, "speakers")
+
+PRECISIONS = {"fp32": torch.float32, "bf16": torch.bfloat16, "fp16": torch.float16}
+
 
 class TTSEngineBase(ABC):
     """Abstract base class for TTS engines."""
 
-    def __init__(self, speaker_wav: str, device: str | None = None):
+    # CUDA backend flags are process-wide, so they only need setting once
+    _cuda_configured = False
+    _cpu_configured = False
+
+    # Output channel count; generate() and generate_stream() return 1D arrays for mono engines
+    channels = 1
+
+    # Whether generate() accepts a speed kwarg and renders tempo changes itself
+    supports_speed = False
+
+    # Short utterance used to warm up a freshly loaded model
+    _WARMUP_TEXT = "Hello there."
+
+    # Loaded models shared by every engine in the process; one is released once no engine holds it
+    _model_cache: "weakref.WeakValueDictionary[tuple, Any]" = weakref.WeakValueDictionary()
+    _model_locks: "weakref.WeakKeyDictionary[Any, threading.Lock]" = weakref.WeakKeyDictionary()
+
+    # Speaker conditioning shared by every engine in the process, least recently used first
+    _speaker_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+
+    # Bytes of the reference file hashed to identify it; covers a whole 10s 24 kHz 16-bit WAV
+    _FINGERPRINT_BYTES = 1 << 20
+
+    # Required on every engine, as plain class attributes (properties also work)
+    name: str  # Human-readable engine name
+    supports_languages: list[str]  # Supported language codes
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        missing = [attr for attr in ("name", "supports_languages") if not hasattr(cls, attr)]
+        if missing:
+            raise TypeError(f"{cls.__name__} must define {', '.join(missing)}")
+
+    def __init__(
+        self,
+        speaker_wav: str,
+        device: str | None = None,
+        compile_model: bool = False,
+        compile_mode: str = "default",
+        quantize: bool = False,
+        precision: str | torch.dtype = "fp32",
+        cpu_threads: int | None = None,
+        warmup: bool = True,
+        speaker_cache_capacity: int = 50,
+        speaker_cache_dir: str | None = DEFAULT_SPEAKER_CACHE_DIR,
+    ):
         self.speaker_wav = speaker_wav
         self.device = device or self._default_device()
+        self.compile_model = compile_model
+        self.compile_mode = compile_mode
+        self.quantize = quantize
+        self.precision = self._resolve_precision(precision)
+        self.cpu_threads = cpu_threads
+        self.warmup = warmup
+        self.speaker_cache_capacity = speaker_cache_capacity
+        self.speaker_cache_dir = speaker_cache_dir
+        self._model = None  # Lazy loading
+        self._fingerprint = None  # ((path, size, mtime_ns), content digest) of speaker_wav
+        self._warmed_up = False
 
     @abstractmethod
     def generate(self, text: str, language: str = "en", **kwargs) -> tuple[np.ndarray, int]:
@@ -27,28 +100,340 @@ class TTSEngineBase(ABC):
         """
         pass
 
+    def generate_batch(self, texts: list[str], language: str = "en", **kwargs) -> list[tuple[np.ndarray, int]]:
+        """
+        Generate audio for several texts.
+
+        The default implementation calls generate() for each text, reusing the loaded
+        model and speaker conditioning. Engines with native batched decoding can override it.
+
+        Args:
+            texts: The texts to convert to speech.
+            language: Language code (e.g., "en", "fr", "de").
+            **kwargs: Engine-specific parameters, applied to every text.
+
+        Returns:
+            List of (audio_data: np.ndarray, sample_rate: int) tuples, one per text.
+        """
+        return [self.generate(text, language=language, **kwargs) for text in texts]
+
+    def generate_stream(self, text: str, language: str = "en", **kwargs) -> Iterator[tuple[np.ndarray, int]]:
+        """
+        Generate audio from text as a sequence of chunks.
+
+        The default implementation yields the whole generate() output as a single chunk.
+        Engines with incremental decoding override it so callers can save or play audio
+        while the rest is still being generated.
+
+        Args:
+            text: The text to convert to speech.
+            language: Language code (e.g., "en", "fr", "de").
+            **kwargs: Engine-specific parameters.
+
+        Yields:
+            Tuples of (audio_chunk: np.ndarray, sample_rate: int), in playback order.
+        """
+        yield self.generate(text, language=language, **kwargs)
+
     @abstractmethod
-    def get_supported_parameters(self) -> dict[str, dict[str, Any]]:
+    def get_supported_parameters(self) -> Mapping[str, Mapping[str, Any]]:
         """
         Return supported parameters with their metadata.
 
         Returns:
-            Dict mapping param_name -> {"type": type, "default": value, "description": str}
+            Mapping of param_name -> {"type": type, "default": value, "description": str}.
+            Callers should treat it as read-only; engines may return a shared object.
         """
         pass
 
     @property
-    @abstractmethod
-    def name(self) -> str:
-        """Human-readable engine name."""
-        pass
+    def model(self) -> Any:
+        """Lazy load the model on first use."""
+        if self._model is None:
+            self._load()
+        return self._model
 
-    @property
-    @abstractmethod
-    def supports_languages(self) -> list:
-        """List of supported language codes."""
-        pass
+    def load(self):
+        """
+        Load the model now instead of on first use, e.g. from a background thread, and warm it up.
+
+        Loading on first use never warms up (see warmup), since the warmup would only delay
+        that first generation.
+        """
+        self._load()
+        self._warmup()
+
+    def _load(self):
+        """Load the model, reusing one already loaded with the same settings and device."""
+        if self._model is not None:
+            return
+        self._configure_device()
+        key = (
+            type(self).__name__,
+            *self._model_key(),
+            self.device,
+            self.compile_model,
+            self.compile_mode,
+            self.quantize,
+        )
+        self._model = TTSEngineBase._model_cache.get(key)
+        if self._model is None:
+            self._model = self._load_model()
+            TTSEngineBase._model_cache[key] = self._model
+
+    def _model_key(self) -> tuple:
+        """Engine settings that select which weights _load_model() loads (model name, variant, ...)."""
+        return ()
+
+    def _load_model(self) -> Any:
+        """Load, freeze and optionally quantize and compile the engine's model."""
+        raise NotImplementedError
+
+    def _model_lock(self) -> threading.Lock:
+        """Lock shared by every engine holding the same model, for engines that keep per-call state on it."""
+        return TTSEngineBase._model_locks.setdefault(self.model, threading.Lock())
+
+    @classmethod
+    def clear_cache(cls):
+        """Drop this engine's shared models; engines still holding one keep it until they are released."""
+        cache = TTSEngineBase._model_cache
+        for key in list(cache.keys()):
+            if cls is TTSEngineBase or key[0] == cls.__name__:
+                cache.pop(key, None)
+
+    def prepare_speaker(self):  # noqa: B027 - optional hook
+        """
+        Compute and cache the speaker conditioning for speaker_wav ahead of the first generate().
+
+        Loads the model if needed and runs a warmup still pending from load(), which needs a
+        speaker reference. The default implementation does nothing, for engines without cached
+        speaker conditioning.
+        """
+
+    def _compute_speaker_latents(self, **params) -> Any:
+        """Encode speaker_wav into the engine's speaker conditioning."""
+        raise NotImplementedError
+
+    def _get_speaker_latents(self, **params) -> Any:
+        """
+        Return the speaker conditioning for speaker_wav, running the speaker encoder at most once.
+
+        Results are kept in a process-wide LRU and, if speaker_cache_dir is set, on disk. Both are
+        keyed by engine, quantization, params and the reference file's content, so other engines
+        and later runs using the same reference skip the encoder too.
+
+        Args:
+            **params: Values the conditioning depends on (model name, conditioning length, ...),
+                      forwarded to _compute_speaker_latents().
+        """
+        # int8 quantization covers the speaker encoders too, so their output differs from fp32.
+        # Precision is left out: engines run the encoders outside autocast
+        key = (
+            type(self).__name__,
+            ("quantize", self.quantize),
+            *sorted(params.items()),
+            self._speaker_fingerprint(),
+        )
+        cache = TTSEngineBase._speaker_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        path = None
+        if self.speaker_cache_dir:
+            digest = hashlib.sha1(repr(key).encode(), usedforsecurity=False).hexdigest()
+            path = os.path.join(self.speaker_cache_dir, f"{digest}.pt")
+
+        latents = None
+        if path and os.path.isfile(path):
+            try:
+                latents = self._read_speaker_latents(path)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable speaker cache {path}: {e}")
+        if latents is None:
+            logger.info(f"Computing speaker conditioning for {self.speaker_wav}")
+            latents = self._compute_speaker_latents(**params)
+            if path:
+                try:
+                    os.makedirs(self.speaker_cache_dir, exist_ok=True)
+                    self._write_speaker_latents(latents, path)
+                except Exception as e:
+                    logger.warning(f"Could not write speaker cache {path}: {e}")
+
+        cache[key] = latents
+        while len(cache) > self.speaker_cache_capacity:
+            cache.popitem(last=False)
+        return latents
+
+    def _speaker_fingerprint(self) -> tuple[int, str]:
+        """Identify speaker_wav by size and a hash of its head; re-hashed only when the file changes."""
+        stat = os.stat(self.speaker_wav)
+        stat_key = (self.speaker_wav, stat.st_size, stat.st_mtime_ns)
+        if self._fingerprint is None or self._fingerprint[0] != stat_key:
+            with open(self.speaker_wav, "rb") as f:
+                digest = hashlib.sha1(f.read(self._FINGERPRINT_BYTES), usedforsecurity=False).hexdigest()
+            self._fingerprint = (stat_key, digest)
+        return stat.st_size, self._fingerprint[1]
+
+    def _write_speaker_latents(self, latents: Any, path: str):
+        """Save speaker conditioning to the disk cache."""
+        torch.save(latents, path)
+
+    def _read_speaker_latents(self, path: str) -> Any:
+        """Load speaker conditioning saved by _write_speaker_latents()."""
+        return torch.load(path, map_location=self.device, weights_only=True)
 
     @staticmethod
     def _default_device() -> str:
         return "cuda" if torch.cuda.is_available() else "cpu"
+
+    def _configure_device(self):
+        """Apply process-wide backend settings for this engine's device."""
+        if self.device == "cuda":
+            self._configure_cuda()
+        elif self.device == "cpu":
+            self._configure_cpu()
+
+    def _configure_cpu(self):
+        """Cap intra-op threads; per-step decoder matmuls are too small to scale across every core."""
+        if self.cpu_threads:
+            torch.set_num_threads(self.cpu_threads)
+        if TTSEngineBase._cpu_configured:
+            return
+        # The half-the-cores default applies once per process, and never over OMP/MKL_NUM_THREADS
+        if not self.cpu_threads and not ({"OMP_NUM_THREADS", "MKL_NUM_THREADS"} & os.environ.keys()):
+            torch.set_num_threads(max(1, (os.cpu_count() or 1) // 2))
+        # Only settable before the process first runs inter-op parallel work
+        with contextlib.suppress(RuntimeError):
+            torch.set_num_interop_threads(1)
+        TTSEngineBase._cpu_configured = True
+
+    @staticmethod
+    def _configure_cuda():
+        """Let matmuls and convolutions use Tensor Core (TF32) kernels."""
+        if TTSEngineBase._cuda_configured:
+            return
+        torch.set_float32_matmul_precision("high")
+        torch.backends.cuda.matmul.allow_tf32 = True
+        torch.backends.cudnn.allow_tf32 = True
+        torch.backends.cudnn.benchmark = True
+        TTSEngineBase._cuda_configured = True
+
+    @staticmethod
+    def _to_numpy(audio: torch.Tensor) -> np.ndarray:
+        """Convert a model output tensor to a 1D float32 array with a single copy at most."""
+        return audio.squeeze().to(device="cpu", dtype=torch.float32).numpy()
+
+    @staticmethod
+    def _resolve_precision(precision: str | torch.dtype) -> torch.dtype:
+        if isinstance(precision, torch.dtype):
+            return precision
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision '{precision}'. Supported: {list(PRECISIONS)}")
+        return PRECISIONS[precision]
+
+    def _autocast(self):
+        """Context that runs the enclosed inference in the configured reduced precision."""
+        if self.precision == torch.float32:
+            return contextlib.nullcontext()
+        return torch.autocast(device_type=self.device.split(":")[0], dtype=self.precision)
+
+    def _run_in_fp32(self, module: torch.nn.Module, method: str = "forward"):
+        """Keep a module (typically the vocoder) out of autocast, upcasting its tensor inputs."""
+        original = getattr(module, method)
+        device_type = self.device.split(":")[0]
+
+        def upcast(value):
+            return value.float() if isinstance(value, torch.Tensor) and value.is_floating_point() else value
+
+        @functools.wraps(original)
+        def run_in_fp32(*args, **kwargs):
+            with torch.autocast(device_type=device_type, enabled=False):
+                return original(*map(upcast, args), **{k: upcast(v) for k, v in kwargs.items()})
+
+        setattr(module, method, run_in_fp32)
+
+    @staticmethod
+    def _remove_weight_norm(module: torch.nn.Module):
+        """Bake weight-norm reparametrizations into plain weights so they aren't recomputed every forward."""
+        from torch.nn.utils import parametrize
+
+        for m in list(module.modules()):
+            if parametrize.is_parametrized(m, "weight"):
+                parametrize.remove_parametrizations(m, "weight")
+            else:
+                with contextlib.suppress(ValueError):  # No hook-based weight norm on this module
+                    torch.nn.utils.remove_weight_norm(m)
+
+    @staticmethod
+    def _freeze(*modules: torch.nn.Module):
+        """Put modules in eval mode and drop autograd state from their parameters."""
+        for module in modules:
+            module.eval()
+            module.requires_grad_(False)
+
+    def _compile(self, module: torch.nn.Module) -> torch.nn.Module:
+        """
+        Compile a module's forward with torch.compile in compile_mode when compile_model is enabled.
+
+        Compilation happens on the first forward. If torch.compile fails there, the module logs it
+        and runs eagerly from then on; other compiled modules and dynamo's own settings are untouched.
+        """
+        if not self.compile_model:
+            return module
+        # Keep compiled kernels across runs, unless the user points inductor elsewhere
+        os.environ.setdefault("TORCHINDUCTOR_CACHE_DIR", os.path.join(_CACHE_ROOT, "inductor"))
+        eager = module.forward
+        try:
+            compiled = torch.compile(eager, mode=self.compile_mode, dynamic=True)
+        except Exception as e:
+            # Setup errors, e.g. an unsupported Python version
+            logger.warning(f"torch.compile unavailable, running {type(module).__name__} eagerly: {e}")
+            return module
+
+        from torch._dynamo.exc import TorchDynamoException
+
+        @functools.wraps(eager)
+        def forward(*args, **kwargs):
+            try:
+                return compiled(*args, **kwargs)
+            except TorchDynamoException as e:
+                logger.warning(f"torch.compile failed, running {type(module).__name__} eagerly: {e}")
+                module.forward = eager
+                return eager(*args, **kwargs)
+
+        module.forward = forward
+        return module
+
+    def _quantize(self, module: torch.nn.Module) -> torch.nn.Module:
+        """Swap a module's Linear layers for dynamic int8 ones when quantize is enabled (CPU only)."""
+        if not self.quantize:
+            return module
+        if self.device != "cpu":
+            logger.warning(f"int8 quantization is CPU-only, keeping {type(module).__name__} in full precision")
+            return module
+        return torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+    def _warmup(self):
+        """
+        Run throwaway generations so CUDA init, compilation and autotuning happen ahead of use.
+
+        Called from load() and prepare_speaker() only; runs once per engine, as soon as a
+        speaker reference is set.
+        """
+        if self._warmed_up or not self.warmup or (self.device != "cuda" and not self.compile_model):
+            return
+        if not self.speaker_wav:
+            logger.debug(f"Deferring {self.name} warmup until a speaker reference is set")
+            return
+        self._warmed_up = True
+        # CUDA graph trees run a warmup pass, then record, then replay
+        runs = 3 if self.compile_model and self.compile_mode == "reduce-overhead" else 1
+        start = time.perf_counter()
+        try:
+            for _ in range(runs):
+                self.generate(self._WARMUP_TEXT, language=self.supports_languages[0])
+        except Exception as e:
+            logger.warning(f"{self.name} warmup failed: {e}")
+            return
+        logger.info(f"{self.name} warmed up in {time.perf_counter() - start:.1f}s")
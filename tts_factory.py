@@ -1,6 +1,10 @@
+import importlib
+import importlib.util
 import logging
+from typing import TYPE_CHECKING
 
-from tts_engine_base import TTSEngineBase
+if TYPE_CHECKING:
+    from tts_engine_base import TTSEngineBase
 
 logger = logging.getLogger("voice_cloner.factory")
 
@@ -8,29 +12,43 @@ logger = logging.getLogger("voice_cloner.factory")
 class TTSFactory:
     """Factory for creating TTS engine instances."""
 
-    # Engine registry: name -> (engine_class, variant_kwargs)
+    # Engine registry: name -> (engine_class or "module:ClassName" path, variant_kwargs)
     _registry: dict[str, tuple] = {}
 
     # Engine display names for UI
     _display_names: dict[str, str] = {}
 
+    # Top-level package each engine needs, checked without importing it
+    _requirements: dict[str, str] = {}
+
     @classmethod
-    def register(cls, name: str, engine_class: type[TTSEngineBase], display_name: str, **default_kwargs):
+    def register(
+        cls,
+        name: str,
+        engine_class: "type[TTSEngineBase] | str",
+        display_name: str,
+        requires: str | None = None,
+        **default_kwargs,
+    ):
         """
         Register an engine class.
 
         Args:
             name: Unique identifier for the engine (e.g., "chatterbox-turbo")
-            engine_class: The engine class to instantiate
+            engine_class: The engine class to instantiate, or its "module:ClassName" path
+                          to defer importing it until the engine is first created
             display_name: Human-readable name for UI
+            requires: Top-level package the engine depends on, used by is_available()
             **default_kwargs: Default kwargs passed to engine constructor
         """
         cls._registry[name] = (engine_class, default_kwargs)
         cls._display_names[name] = display_name
+        if requires:
+            cls._requirements[name] = requires
         logger.debug(f"Registered TTS engine: {name}")
 
     @classmethod
-    def create(cls, engine_name: str, speaker_wav: str, device: str | None = None, **engine_kwargs) -> TTSEngineBase:
+    def create(cls, engine_name: str, speaker_wav: str, device: str | None = None, **engine_kwargs) -> "TTSEngineBase":
         """
         Create an engine instance.
 
@@ -48,6 +66,10 @@ class TTSFactory:
             raise ValueError(f"Unknown engine: '{engine_name}'. " f"Available engines: {available}")
 
         engine_class, default_kwargs = cls._registry[engine_name]
+        if isinstance(engine_class, str):
+            module_path, _, class_name = engine_class.partition(":")
+            engine_class = getattr(importlib.import_module(module_path), class_name)
+            cls._registry[engine_name] = (engine_class, default_kwargs)
 
         # Merge default kwargs with provided kwargs
         merged_kwargs = {**default_kwargs, **engine_kwargs}
@@ -72,54 +94,40 @@ class TTSFactory:
 
     @classmethod
     def is_available(cls, engine_name: str) -> bool:
-        """Check if an engine's dependencies are installed."""
+        """Check if an engine's dependencies are installed, without importing them."""
         if engine_name not in cls._registry:
             return False
 
-        engine_class, _ = cls._registry[engine_name]
-
-        # Check for required imports
-        try:
-            if "coqui" in engine_name.lower():
-                import TTS  # noqa: F401
-            elif "chatterbox" in engine_name.lower():
-                import chatterbox  # noqa: F401
-            return True
-        except ImportError:
-            return False
+        requirement = cls._requirements.get(engine_name)
+        return requirement is None or importlib.util.find_spec(requirement) is not None
 
 
 def _register_default_engines():
-    """Register the default TTS engines."""
-    # Register Coqui engine
-    try:
-        from engines.coqui_engine import CoquiEngine
-
-        TTSFactory.register(name="coqui", engine_class=CoquiEngine, display_name="Coqui XTTS v2")
-    except ImportError as e:
-        logger.warning(f"Coqui engine not available: {e}")
-
-    # Register Chatterbox engines
-    try:
-        from engines.chatterbox_engine import ChatterboxEngine
-
-        # Chatterbox Turbo (fast, supports paralinguistic tags)
-        TTSFactory.register(
-            name="chatterbox-turbo",
-            engine_class=ChatterboxEngine,
-            display_name="Chatterbox Turbo (350M)",
-            variant="turbo",
-        )
-
-        # Chatterbox Standard (higher quality)
-        TTSFactory.register(
-            name="chatterbox-standard",
-            engine_class=ChatterboxEngine,
-            display_name="Chatterbox Standard (500M)",
-            variant="standard",
-        )
-    except ImportError as e:
-        logger.warning(f"Chatterbox engines not available: {e}")
+    """Register the default TTS engines by import path, so no engine code loads until it is used."""
+    TTSFactory.register(
+        name="coqui",
+        engine_class="engines.coqui_engine:CoquiEngine",
+        display_name="Coqui XTTS v2",
+        requires="TTS",
+    )
+
+    # Chatterbox Turbo (fast, supports paralinguistic tags)
+    TTSFactory.register(
+        name="chatterbox-turbo",
+        engine_class="engines.chatterbox_engine:ChatterboxEngine",
+        display_name="Chatterbox Turbo (350M)",
+        requires="chatterbox",
+        variant="turbo",
+    )
+
+    # Chatterbox Standard (higher quality)
+    TTSFactory.register(
+        name="chatterbox-standard",
+        engine_class="engines.chatterbox_engine:ChatterboxEngine",
+        display_name="Chatterbox Standard (500M)",
+        requires="chatterbox",
+        variant="standard",
+    )
 
 
 # Auto-register engines on module import
@@ -6,16 +6,16 @@ from rich.console import Console
 from rich.logging import RichHandler
 
 from tts_factory import TTSFactory
-from voice_cloner import VoiceCloner
 
-# Configure logging with Rich for a better terminal experience
-logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[RichHandler(rich_tracebacks=True)])
 logger = logging.getLogger("voice_cloner")
 
 console = Console()
 
 
 def main():
+    # Configure logging with Rich for a better terminal experience
+    logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[RichHandler(rich_tracebacks=True)])
+
     # Get available engines for help text
     available_engines = TTSFactory.available_engines()
     engines_help = ", ".join(available_engines)
@@ -35,6 +35,12 @@ Examples:
   python vcloner.py -i voice.wav -t "That's funny [laugh]!" -o output.wav \\
       --engine chatterbox-turbo --cfg-weight 0.3 --exaggeration 0.7
 
+  # Start playback while a long text is still being generated
+  python vcloner.py -i voice.wav -t "A long paragraph..." -o output.wav --stream
+
+  # Generate a long text sentence by sentence, joined with short pauses
+  python vcloner.py -i voice.wav -t "First sentence. Second sentence." -o output.wav --batch
+
   # List available engines
   python vcloner.py --list-engines
         """,
@@ -75,9 +81,27 @@ Examples:
         help="Chatterbox: Expressiveness level (0.0-1.5). Higher = more dramatic. Default: 0.5",
     )
 
+    # Performance arguments
+    parser.add_argument(
+        "--precision",
+        choices=["fp32", "bf16", "fp16"],
+        default="fp32",
+        help="Inference precision for the decoder (bf16/fp16 are faster on recent GPUs). Default: fp32",
+    )
+
     # Utility arguments
     parser.add_argument("--list-engines", action="store_true", help="List available TTS engines and exit.")
     parser.add_argument("--no-play", action="store_true", help="Don't play audio after generation.")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Play and save audio chunk by chunk while it is generated (incremental with Coqui XTTS).",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Generate the text sentence by sentence and join the clips with short pauses.",
+    )
 
     args = parser.parse_args()
 
@@ -97,6 +121,8 @@ Examples:
         parser.print_help()
         console.print("\n[red]Error:[/red] -i, -t, and -o are required for audio generation.")
         return
+    if args.stream and args.batch:
+        parser.error("--stream and --batch cannot be used together")
 
     # Ensure the directory for the output file exists
     output_dir = os.path.dirname(args.output_file)
@@ -104,6 +130,9 @@ Examples:
         os.makedirs(output_dir, exist_ok=True)
 
     try:
+        # Deferred so --help, --list-engines and argument errors don't pay for torch/transformers
+        from voice_cloner import VoiceCloner
+
         logger.info("[bold cyan]Initializing VoiceCloner[/bold cyan]")
         logger.info(f"  Engine: {args.engine}")
         logger.info(f"  Reference voice: {args.input_voice}")
@@ -118,12 +147,22 @@ Examples:
             engine_kwargs["exaggeration"] = args.exaggeration
 
         # Create cloner
-        cloner = VoiceCloner(speaker_wav=args.input_voice, engine=args.engine)
+        cloner = VoiceCloner(speaker_wav=args.input_voice, engine=args.engine, precision=args.precision)
 
         logger.info("[bold green]Generating speech...[/bold green]")
-        cloner.say(
-            args.text, play_audio=not args.no_play, save_audio=True, output_file=args.output_file, **engine_kwargs
-        )
+        if args.batch:
+            cloner.say_many(
+                args.text, play_audio=not args.no_play, save_audio=True, output_file=args.output_file, **engine_kwargs
+            )
+        else:
+            cloner.say(
+                args.text,
+                play_audio=not args.no_play,
+                save_audio=True,
+                output_file=args.output_file,
+                stream=args.stream,
+                **engine_kwargs,
+            )
 
         logger.info(f"[bold green]Speech saved to:[/bold green] {args.output_file}")
 
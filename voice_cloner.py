@@ -1,28 +1,31 @@
 import logging
 import os
+import re
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
 
+import numpy as np
 import sounddevice as sd
 import soundfile as sf
-from rich.console import Console
-from rich.logging import RichHandler
-from transformers import logging as transformers_logging
+from tqdm import tqdm
 
 from tts_engine_base import TTSEngineBase
 from tts_factory import TTSFactory
 
-# Suppress warnings globally
-warnings.filterwarnings("ignore", category=FutureWarning)
-warnings.filterwarnings("ignore", category=UserWarning)
+# Library code only logs; applications (vcloner.py, the GUI) configure handlers
+logger = logging.getLogger("voice_cloner")
 
-# Suppress specific warnings from Hugging Face Transformers
-transformers_logging.set_verbosity_error()
+# Sentence boundaries: whitespace after terminal punctuation, or right after CJK full-width
+# punctuation, which is usually not followed by a space
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+|(?<=[\u3002\uff01\uff1f])\s*")
 
-# Set up logging with RichHandler
-logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[RichHandler(rich_tracebacks=True)])
-logger = logging.getLogger("voice_cloner")
-console = Console()
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentences at terminal punctuation, dropping empty pieces."""
+    return [sentence for sentence in _SENTENCE_END_RE.split(text.strip()) if sentence]
 
 
 class VoiceCloner:
@@ -35,8 +38,16 @@ class VoiceCloner:
     - Chatterbox Standard (higher quality)
     """
 
+    # Warning filters and third-party log levels are process-wide, so they only need setting once
+    _library_logging_configured = False
+
     def __init__(
-        self, speaker_wav: str, engine: str | TTSEngineBase | None = None, device: str | None = None, **engine_kwargs
+        self,
+        speaker_wav: str,
+        engine: str | TTSEngineBase | None = None,
+        device: str | None = None,
+        show_progress: bool = True,
+        **engine_kwargs,
     ):
         """
         Initialize the VoiceCloner.
@@ -46,9 +57,13 @@ class VoiceCloner:
             engine: Either an engine name (str) or a TTSEngineBase instance.
                    Defaults to "coqui" if not specified.
             device: Device to use ("cuda" or "cpu"). Auto-detected if None.
+            show_progress: Show a progress bar of generated audio while streaming.
             **engine_kwargs: Additional parameters passed to engine constructor.
         """
+        self._configure_library_logging()
         self.speaker_wav = speaker_wav
+        self.show_progress = show_progress
+        self._out_stream = None  # Output stream reused across playbacks, opened on first use
 
         # Ensure the speaker reference file exists
         if not os.path.exists(self.speaker_wav):
@@ -68,6 +83,18 @@ class VoiceCloner:
 
         logger.info(f"VoiceCloner initialized with engine: {self.engine.name}")
 
+    @staticmethod
+    def _configure_library_logging():
+        """Suppress FutureWarning/UserWarning noise and Hugging Face Transformers' info output."""
+        if VoiceCloner._library_logging_configured:
+            return
+        from transformers import logging as transformers_logging  # Slow to import; engines load it anyway
+
+        warnings.filterwarnings("ignore", category=FutureWarning)
+        warnings.filterwarnings("ignore", category=UserWarning)
+        transformers_logging.set_verbosity_error()
+        VoiceCloner._library_logging_configured = True
+
     @classmethod
     def from_coqui(
         cls,
@@ -104,6 +131,25 @@ class VoiceCloner:
         engine_name = f"chatterbox-{variant}"
         return cls(speaker_wav=speaker_wav, engine=engine_name, device=device)
 
+    def update_speaker(self, speaker_wav: str, prepare: bool = True):
+        """
+        Switch to a different speaker reference, keeping the loaded engine.
+
+        Conditioning for a reference that was used before comes from the speaker cache.
+
+        Args:
+            speaker_wav: Path to the new speaker reference audio file.
+            prepare: Compute the speaker conditioning now instead of on the next say().
+        """
+        if not os.path.exists(speaker_wav):
+            logger.error(f"Speaker reference file not found: {speaker_wav}")
+            raise FileNotFoundError(f"Speaker reference file not found: {speaker_wav}")
+
+        self.speaker_wav = speaker_wav
+        self.engine.speaker_wav = speaker_wav
+        if prepare:
+            self.engine.prepare_speaker()
+
     def say(
         self,
         text_to_voice: str,
@@ -112,6 +158,8 @@ class VoiceCloner:
         save_audio: bool = False,
         output_file: str | None = None,
         speed: float = 1.0,
+        stream: bool = False,
+        stop_event: threading.Event | None = None,
         **kwargs,
     ):
         """
@@ -123,55 +171,288 @@ class VoiceCloner:
             play_audio: Whether to play the audio.
             save_audio: Whether to save to file.
             output_file: Output file path (auto-generated if not provided).
-            speed: Playback speed multiplier.
+            speed: Speech tempo multiplier, applied without changing pitch (also to the saved file).
+            stream: Save and play audio chunk by chunk as the engine produces it, instead of
+                    holding the whole clip in memory. Engines without incremental decoding
+                    produce a single chunk.
+            stop_event: With stream=True, generation and playback stop at the next chunk once
+                        this event is set (e.g. from another thread).
             **kwargs: Engine-specific parameters (e.g., cfg_weight for Chatterbox).
         """
-        logger.info(f"Generating speech for: '{text_to_voice[:50]}...' [{language}]")
+        logger.debug(f"Generating speech for: '{text_to_voice[:50]}...' [{language}]")
 
         # Determine output file
         if save_audio and not output_file:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = f"generated_audio_{timestamp}.wav"
 
+        self._ensure_output_dir(output_file)
+        speed = self._native_speed(speed, kwargs)
+
+        try:
+            if stream:
+                chunks = self.engine.generate_stream(text=text_to_voice, language=language, **kwargs)
+                self._output_stream(chunks, play_audio, save_audio, output_file, speed, stop_event)
+            else:
+                # Generate audio using the engine
+                audio_data, sample_rate = self.engine.generate(text=text_to_voice, language=language, **kwargs)
+                self._output_audio(audio_data, sample_rate, play_audio, save_audio, output_file, speed)
+        except Exception as e:
+            logger.error(f"Error during TTS generation: {e}")
+            raise
+
+    def say_batch(
+        self,
+        texts: list[str],
+        language: str = "en",
+        play_audio: bool = True,
+        save_audio: bool = False,
+        output_files: list[str] | None = None,
+        speed: float = 1.0,
+        **kwargs,
+    ):
+        """
+        Convert several texts to speech, one clip per text.
+
+        The texts go to the engine's generate_batch(), which reuses the loaded model and speaker
+        conditioning. Both bundled engines generate the texts one after another.
+
+        Args:
+            texts: Texts to synthesize, each producing its own audio clip.
+            language: Language code (e.g., "en", "fr").
+            play_audio: Whether to play each clip in order.
+            save_audio: Whether to save the clips to files.
+            output_files: Output file paths, one per text (auto-generated if not provided).
+            speed: Speech tempo multiplier, applied without changing pitch (also to saved files).
+            **kwargs: Engine-specific parameters, applied to every text.
+        """
+        if output_files is not None and len(output_files) != len(texts):
+            raise ValueError(f"Expected {len(texts)} output files, got {len(output_files)}")
+
+        logger.debug(f"Generating speech for {len(texts)} texts [{language}]")
+
+        # Determine output files
+        if save_audio and not output_files:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_files = [f"generated_audio_{timestamp}_{i + 1}.wav" for i in range(len(texts))]
+
+        for output_file in output_files or []:
+            self._ensure_output_dir(output_file)
+        speed = self._native_speed(speed, kwargs)
+
+        try:
+            results = self.engine.generate_batch(texts, language=language, **kwargs)
+            for i, (audio_data, sample_rate) in enumerate(results):
+                output_file = output_files[i] if output_files else None
+                self._output_audio(audio_data, sample_rate, play_audio, save_audio, output_file, speed)
+        except Exception as e:
+            logger.error(f"Error during TTS generation: {e}")
+            raise
+
+    def say_many(
+        self,
+        text_to_voice: str,
+        language: str = "en",
+        play_audio: bool = True,
+        save_audio: bool = False,
+        output_file: str | None = None,
+        speed: float = 1.0,
+        pause: float = 0.2,
+        **kwargs,
+    ):
+        """
+        Convert multi-sentence text to speech by generating it sentence by sentence.
+
+        The sentences go to the engine in one generate_batch() call, so engines with batched
+        decoding can run them together. The clips are joined into a single output.
+
+        Args:
+            text_to_voice: Text to synthesize; split at ".", "!" and "?" and their CJK full-width forms.
+            language: Language code (e.g., "en", "fr").
+            play_audio: Whether to play the audio.
+            save_audio: Whether to save to file.
+            output_file: Output file path (auto-generated if not provided).
+            speed: Speech tempo multiplier, applied without changing pitch (also to the saved file).
+            pause: Seconds of silence inserted between sentences.
+            **kwargs: Engine-specific parameters, applied to every sentence.
+        """
+        sentences = split_sentences(text_to_voice)
+        if not sentences:
+            raise ValueError("Text cannot be empty")
+
+        logger.debug(f"Generating speech for {len(sentences)} sentences [{language}]")
+
+        # Determine output file
+        if save_audio and not output_file:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_file = f"generated_audio_{timestamp}.wav"
+
+        self._ensure_output_dir(output_file)
+        speed = self._native_speed(speed, kwargs)
+
+        try:
+            results = self.engine.generate_batch(sentences, language=language, **kwargs)
+            sample_rate = results[0][1]
+            clips = [np.asarray(audio_data, dtype=np.float32) for audio_data, _ in results]
+            silence = np.zeros((int(pause * sample_rate), *clips[0].shape[1:]), dtype=np.float32)
+            pieces = [silence] * (2 * len(clips) - 1)
+            pieces[::2] = clips
+            audio_data = np.concatenate(pieces)
+            self._output_audio(audio_data, sample_rate, play_audio, save_audio, output_file, speed)
+        except Exception as e:
+            logger.error(f"Error during TTS generation: {e}")
+            raise
+
+    @staticmethod
+    def _ensure_output_dir(output_file: str | None):
+        """Create the directory for an output file if needed."""
         if output_file:
             output_dir = os.path.dirname(output_file) or "."
             os.makedirs(output_dir, exist_ok=True)
 
-        with console.status(f"[bold cyan]Generating audio with {self.engine.name}...[/bold cyan]"):
-            try:
-                # Generate audio using the engine
-                audio_data, sample_rate = self.engine.generate(text=text_to_voice, language=language, **kwargs)
+    def _native_speed(self, speed: float, engine_kwargs: dict) -> float:
+        """Hand the speed to engines that render it natively; returns the speed still to apply."""
+        if speed != 1.0 and self.engine.supports_speed:
+            engine_kwargs["speed"] = speed
+            return 1.0
+        return speed
+
+    @staticmethod
+    def _time_stretch(audio_data, speed: float):
+        """Change tempo without changing pitch, so playback and saved files run at the native rate."""
+        if speed == 1.0:
+            return audio_data
+        import librosa  # Slow to import and only needed for speed changes
+
+        return librosa.effects.time_stretch(np.asarray(audio_data, dtype=np.float32), rate=speed)
+
+    def _output_audio(
+        self, audio_data, sample_rate: int, play_audio: bool, save_audio: bool, output_file: str | None, speed: float
+    ):
+        """Save and/or play a generated clip."""
+        # float32 once up front: libsndfile converts it straight to PCM_16 and playback needs no copy
+        audio_data = np.asarray(self._time_stretch(audio_data, speed), dtype=np.float32)
 
-                # Save if requested
-                if save_audio and output_file:
-                    sf.write(output_file, audio_data, sample_rate)
-                    logger.info(f"Audio saved to {output_file}")
+        # Save in the background so encoding and disk I/O overlap playback
+        with ThreadPoolExecutor(max_workers=1) as io_pool:
+            saved = (
+                io_pool.submit(sf.write, output_file, audio_data, sample_rate) if save_audio and output_file else None
+            )
 
-                # Play if requested
-                if play_audio:
-                    self._play_audio(audio_data, sample_rate, speed)
+            # Play if requested
+            if play_audio:
+                self._play_audio(audio_data, sample_rate)
 
-            except Exception as e:
-                logger.error(f"Error during TTS generation: {e}")
-                raise
+        if saved is not None:
+            saved.result()
+            logger.info(f"Audio saved to {output_file}")
 
-    def _play_audio(self, audio_data, sample_rate: int, speed: float = 1.0):
+    def _output_stream(
+        self,
+        chunks,
+        play_audio: bool,
+        save_audio: bool,
+        output_file: str | None,
+        speed: float,
+        stop_event: threading.Event | None = None,
+    ):
+        """Save and/or play audio chunks as they are generated."""
+        # On Ctrl-C the stack closes the file and the stream before the interrupt propagates
+        with ExitStack() as stack:
+            # One writer thread keeps chunk writes in order and off the generation loop
+            io_pool = stack.enter_context(ThreadPoolExecutor(max_workers=1))
+            writes = []
+            progress = stack.enter_context(
+                tqdm(
+                    desc=self.engine.name,
+                    unit="s",
+                    bar_format="{desc}: {n:.1f}{unit} of audio [{elapsed}]",
+                    disable=not self.show_progress,
+                )
+            )
+            writer = player = None
+            plays = []
+            for chunk, sample_rate in chunks:
+                if stop_event is not None and stop_event.is_set():
+                    logger.info("Generation stopped")
+                    # Drop chunks still waiting for the device; the one already playing finishes
+                    for play in plays:
+                        play.cancel()
+                    break
+                progress.update(len(chunk) / sample_rate)
+                chunk = self._time_stretch(chunk, speed)
+                if writer is None and save_audio and output_file:
+                    writer = sf.SoundFile(output_file, "w", sample_rate, self.engine.channels)
+                    # Queued behind the pending writes; the pool's shutdown then waits for it
+                    stack.callback(io_pool.submit, writer.close)
+                if player is None and play_audio:
+                    try:
+                        player = self._output_device(sample_rate, self.engine.channels)
+                        player.start()
+                        stack.callback(player.stop)
+                        # Blocking writes run on their own thread, so the next chunk decodes while
+                        # this one plays. Registered after player.stop, so queued audio drains first,
+                        # unless an exception (e.g. Ctrl-C) is unwinding the stack
+                        play_pool = ThreadPoolExecutor(max_workers=1)
+                        stack.push(
+                            lambda exc_type, *_, pool=play_pool: pool.shutdown(cancel_futures=exc_type is not None)
+                        )
+                    except Exception as e:
+                        logger.error(f"Error playing audio: {e}")
+                        play_audio = False
+
+                if writer is not None:
+                    writes.append(io_pool.submit(writer.write, chunk))
+                if player is not None:
+                    plays.append(play_pool.submit(player.write, np.ascontiguousarray(chunk, dtype=np.float32)))
+
+        if writer is not None:
+            for write in writes:
+                write.result()
+            logger.info(f"Audio saved to {output_file}")
+        if player is not None:
+            for play in plays:
+                if not play.cancelled():
+                    play.result()
+            logger.debug("Audio playback finished.")
+
+    def _play_audio(self, audio_data, sample_rate: int):
         """
         Play the generated audio.
 
         Args:
             audio_data: Audio samples as numpy array.
             sample_rate: Audio sample rate.
-            speed: Playback speed multiplier.
         """
         try:
-            adjusted_sample_rate = int(sample_rate * speed)
-            sd.play(audio_data, adjusted_sample_rate)
-            sd.wait()
-            logger.info("Audio playback finished.")
+            # Frames x channels view of the clip; PortAudio reads float32 C-contiguous data without a copy
+            audio = np.ascontiguousarray(audio_data, dtype=np.float32).reshape(len(audio_data), -1)
+            stream = self._output_device(sample_rate, audio.shape[1])
+            stream.start()
+            try:
+                stream.write(audio)
+            finally:
+                stream.stop()  # Returns once the buffered audio has played
+            logger.debug("Audio playback finished.")
         except Exception as e:
             logger.error(f"Error playing audio: {e}")
 
+    def _output_device(self, sample_rate: int, channels: int) -> sd.OutputStream:
+        """Return the reusable output stream, reopening it only when the audio format changes."""
+        stream = self._out_stream
+        if stream is None or stream.samplerate != sample_rate or stream.channels != channels:
+            if stream is not None:
+                stream.close()
+            self._out_stream = None
+            stream = self._out_stream = sd.OutputStream(samplerate=sample_rate, channels=channels, dtype="float32")
+        return stream
+
+    def close(self):
+        """Release the audio output stream. The cloner reopens it if it plays audio again."""
+        if self._out_stream is not None:
+            self._out_stream.close()
+            self._out_stream = None
+
     def get_engine_parameters(self):
         """Get supported parameters for the current engine."""
         return self.engine.get_supported_parameters()
@@ -1,14 +1,21 @@
 import contextlib
+import functools
+import logging
+import os
+import shutil
 import sys
 import tempfile
+import threading
 import uuid
 from pathlib import Path
 
-import pygame
-from PySide6.QtCore import QThread, Signal, Slot
+import sounddevice as sd
+import soundfile as sf
+from PySide6.QtCore import QObject, QThread, Signal, Slot
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import (
     QApplication,
+    QCheckBox,
     QComboBox,
     QFileDialog,
     QGroupBox,
@@ -23,42 +30,136 @@ from PySide6.QtWidgets import (
 )
 
 from gui.engine_controls import EngineControlsFactory
-from voice_cloner import VoiceCloner
+from tts_factory import TTSFactory
 
+logger = logging.getLogger("voice_cloner.gui")
 
-class CloneThread(QThread):
-    """Thread for running TTS generation without blocking the UI."""
 
+@functools.cache
+def _window_icon() -> QIcon:
+    """Window icon, decoded once per process."""
+    return QIcon(str(Path(__file__).parent / "icon.jpg"))
+
+
+class CloneWorker(QObject):
+    """Loads engines and runs TTS generation on a background thread, one job at a time."""
+
+    engine_loaded = Signal(str, bool)
+    speaker_prepared = Signal(str, bool, str)
     finished = Signal(str, str)
+    cancelled = Signal()
     error_occurred = Signal(str)
 
-    def __init__(self, text: str, voice_path: str, engine_name: str, engine_params: dict):
+    def __init__(self):
         super().__init__()
-        self.text = text
-        self.voice_path = voice_path
-        self.engine_name = engine_name
-        self.engine_params = engine_params
-        self.output_path = None
-
-    def run(self):
+        # Loaded engines stay in memory so switching back is instant
+        self._engines = {}
+        self._cloners = {}
+        # One output file per session, overwritten by each generation
+        self.output_path = Path(tempfile.gettempdir()) / "voice_cloning" / f"output_{uuid.uuid4().hex}.wav"
+        self._stop = threading.Event()
+
+    def _engine(self, engine_name: str, fast: bool):
+        engine = self._engines.get((engine_name, fast))
+        if engine is None:
+            import torch
+
+            # The speaker reference is set per generation. On a GPU the decoder is compiled; that
+            # happens in the warmup prepare_speaker() runs once a voice is selected, not on a click.
+            cuda = torch.cuda.is_available()
+            engine_kwargs = {"compile_model": cuda}
+            if fast:
+                # Fast mode: half-precision decoding on a GPU, int8 Linears on the CPU
+                if cuda:
+                    engine_kwargs["precision"] = "bf16" if torch.cuda.is_bf16_supported() else "fp16"
+                else:
+                    engine_kwargs["quantize"] = True
+            engine = TTSFactory.create(engine_name, speaker_wav="", **engine_kwargs)
+            engine.load()
+            self._engines[(engine_name, fast)] = engine
+        return engine
+
+    @Slot(str, bool)
+    def load_engine(self, engine_name: str, fast: bool):
+        """Load an engine ahead of its first generation."""
         try:
-            # Create temporary output directory
-            output_dir = Path(tempfile.gettempdir()) / "voice_cloning"
-            output_dir.mkdir(exist_ok=True)
-
-            # Generate unique filename
-            self.output_path = output_dir / f"output_{uuid.uuid4().hex}.wav"
-
-            # Create VoiceCloner with selected engine
-            voice_cloner = VoiceCloner(speaker_wav=self.voice_path, engine=self.engine_name)
+            self._engine(engine_name, fast)
+        except Exception as e:
+            logger.warning(f"Could not preload {engine_name}: {e}")
+        # Reported either way; a failed load surfaces its error on the next generation
+        self.engine_loaded.emit(engine_name, fast)
 
-            # Generate audio
-            voice_cloner.say(
-                self.text, play_audio=False, save_audio=True, output_file=str(self.output_path), **self.engine_params
-            )
-            self.finished.emit(str(self.output_path), self.text)
+    @Slot(str, bool, str)
+    def prepare_speaker(self, engine_name: str, fast: bool, voice_path: str):
+        """Compute the conditioning for a newly selected voice, warming the engine up on the first one."""
+        try:
+            engine = self._engine(engine_name, fast)
+            engine.speaker_wav = voice_path
+            engine.prepare_speaker()
+        except Exception as e:
+            logger.warning(f"Could not prepare voice {Path(voice_path).name}: {e}")
+        # Reported either way, like engine_loaded
+        self.speaker_prepared.emit(engine_name, fast, voice_path)
+
+    def close(self):
+        """Release the cloners' audio output streams; call once the worker thread has stopped."""
+        for voice_cloner in self._cloners.values():
+            voice_cloner.close()
+
+    def cancel(self):
+        """Stop the running generation; called directly from the GUI thread, not queued."""
+        self._stop.set()
+
+    def reset_cancel(self):
+        """Drop a Stop that arrived after the last job had already ended; called before queueing a job."""
+        self._stop.clear()
+
+    @Slot(str, str, str, bool, dict, bool)
+    def clone(self, text: str, voice_path: str, engine_name: str, fast: bool, engine_params: dict, play: bool):
+        if self._stop.is_set():
+            # Cancelled while still queued
+            self._stop.clear()
+            self.cancelled.emit()
+            return
+        try:
+            output_path = self.output_path
+            output_path.parent.mkdir(exist_ok=True)
+
+            # Imported here so torch and transformers load off the GUI thread
+            from voice_cloner import VoiceCloner
+
+            voice_cloner = self._cloners.get((engine_name, fast))
+            if voice_cloner is None:
+                voice_cloner = VoiceCloner(
+                    speaker_wav=voice_path, engine=self._engine(engine_name, fast), show_progress=False
+                )
+                self._cloners[(engine_name, fast)] = voice_cloner
+            voice_cloner.update_speaker(voice_path, prepare=False)
+
+            # Generate audio; when playing, stream it so playback starts with the first chunk
+            try:
+                voice_cloner.say(
+                    text,
+                    play_audio=play,
+                    save_audio=True,
+                    output_file=str(output_path),
+                    stream=play,
+                    stop_event=self._stop,
+                    **engine_params,
+                )
+            finally:
+                # Free the output device for the Play button's sd.play(); exclusive devices allow one stream
+                voice_cloner.close()
         except Exception as e:
+            self._stop.clear()
             self.error_occurred.emit(str(e))
+            return
+        # Generations that cannot stop early still run to the end; their result is dropped
+        if self._stop.is_set():
+            self._stop.clear()
+            self.cancelled.emit()
+        else:
+            self.finished.emit(str(output_path), text)
 
 
 class VoiceCloningApp(QMainWindow):
@@ -71,32 +172,57 @@ class VoiceCloningApp(QMainWindow):
         ("Chatterbox Standard (High Quality)", "chatterbox-standard"),
     ]
 
+    # Jobs for the worker; queued connections run them on its thread in order
+    load_engine_requested = Signal(str, bool)
+    prepare_speaker_requested = Signal(str, bool, str)
+    clone_requested = Signal(str, str, str, bool, dict, bool)
+
     def __init__(self):
         super().__init__()
         self.current_audio = None
         self.voice_path = None
         self.engine_controls = None
-        self.clone_thread = None
-        self._temp_voice_file = None
+        self._generating = False
+        self._temp_voice_file = None  # Hard-link snapshot of the voice file, when one could be made
+        self._worker_voice = None  # Voice path handed to the worker: the snapshot or the original
+        self._voice_stat = None  # (path, size, mtime_ns) of the voice file _worker_voice was taken from
+        self._current_audio_data = None  # (samples, sample_rate) of current_audio, read on first play
+        self._loaded_engines = set()  # (engine_name, fast) pairs the worker has loaded
+        self._prepared_speakers = set()  # (engine_name, fast, voice_path) the worker has encoded
+
+        # One long-lived worker thread owns the engines and runs every load and generation
+        self._worker_thread = QThread()
+        self._worker = CloneWorker()
+        self._worker.moveToThread(self._worker_thread)
+        self.load_engine_requested.connect(self._worker.load_engine)
+        self.prepare_speaker_requested.connect(self._worker.prepare_speaker)
+        self.clone_requested.connect(self._worker.clone)
+        self._worker.engine_loaded.connect(self.on_engine_loaded)
+        self._worker.speaker_prepared.connect(self.on_speaker_prepared)
+        self._worker.finished.connect(self.on_cloning_finished)
+        self._worker.cancelled.connect(self._reset_ui_state)
+        self._worker.error_occurred.connect(self.on_cloning_error)
+        self._worker_thread.start()
 
         self.init_ui()
         self.setWindowTitle("VoiceCloner")
         self.setMinimumSize(650, 550)
-        self.setWindowIcon(QIcon(str(Path(__file__).parent / "icon.jpg")))
+        self.setWindowIcon(_window_icon())
 
-        # Initialize pygame mixer for audio
-        pygame.mixer.init()
+        # Load the default engine while the user picks a voice and types
+        self._request_engine()
 
     def closeEvent(self, event):
         """Clean up resources when window closes."""
         # Stop any playing audio
-        pygame.mixer.music.stop()
-        pygame.mixer.quit()
+        sd.stop()
 
-        # Wait for thread to finish
-        if self.clone_thread and self.clone_thread.isRunning():
-            self.clone_thread.quit()
-            self.clone_thread.wait(1000)
+        # Stop a streaming generation at its next chunk, then wait for the worker's current job.
+        # A running slot can't be interrupted, and destroying a running QThread aborts the process.
+        self._worker.cancel()
+        self._worker_thread.quit()
+        self._worker_thread.wait()
+        self._worker.close()
 
         # Clean up temp files
         self._cleanup_temp_files()
@@ -105,12 +231,13 @@ class VoiceCloningApp(QMainWindow):
 
     def _cleanup_temp_files(self):
         """Clean up temporary files."""
-        if self._temp_voice_file and Path(self._temp_voice_file).exists():
+        # unlink() alone: a missing file is just another suppressed OSError, no stat needed first
+        if self._temp_voice_file:
             with contextlib.suppress(OSError):
                 Path(self._temp_voice_file).unlink()
-        if self.current_audio and Path(self.current_audio).exists():
-            with contextlib.suppress(OSError):
-                Path(self.current_audio).unlink()
+        # The worker's session output, written even if every generation was cancelled or failed
+        with contextlib.suppress(OSError):
+            self._worker.output_path.unlink()
 
     def init_ui(self):
         main_widget = QWidget()
@@ -131,6 +258,11 @@ class VoiceCloningApp(QMainWindow):
         engine_row.addWidget(self.engine_combo)
         model_layout.addLayout(engine_row)
 
+        self.fast_mode = QCheckBox("Fast mode (reduced precision)")
+        self.fast_mode.setToolTip("bf16/fp16 decoding on a GPU, int8 quantization on the CPU")
+        self.fast_mode.toggled.connect(self._request_engine)
+        model_layout.addWidget(self.fast_mode)
+
         # Container for engine-specific controls
         self.controls_container = QVBoxLayout()
         model_layout.addLayout(self.controls_container)
@@ -186,6 +318,10 @@ class VoiceCloningApp(QMainWindow):
         """)
         layout.addWidget(self.btn_generate)
 
+        self.play_while_generating = QCheckBox("Play while generating")
+        self.play_while_generating.setChecked(True)
+        layout.addWidget(self.play_while_generating)
+
         # Result controls
         result_layout = QHBoxLayout()
         self.btn_play = QPushButton("Play")
@@ -220,6 +356,50 @@ class VoiceCloningApp(QMainWindow):
         """Handle engine selection change."""
         engine_name = self.engine_combo.currentData()
         self._update_engine_controls(engine_name)
+        self._request_engine()
+
+    def _request_engine(self):
+        """Have the worker load the selected engine and mode unless it already has."""
+        self._update_generate_button()
+        key = (self.engine_combo.currentData(), self.fast_mode.isChecked())
+        if key not in self._loaded_engines:
+            self.load_engine_requested.emit(*key)
+        self._request_speaker()
+
+    def _request_speaker(self):
+        """Have the worker encode the selected voice for the selected engine.
+
+        Encodings are cached by file content, so the snapshot generated from later hits the cache.
+        """
+        self._update_generate_button()
+        key = (self.engine_combo.currentData(), self.fast_mode.isChecked(), self.voice_path)
+        if self.voice_path and key not in self._prepared_speakers:
+            self.prepare_speaker_requested.emit(*key)
+
+    @Slot(str, bool)
+    def on_engine_loaded(self, engine_name: str, fast: bool):
+        self._loaded_engines.add((engine_name, fast))
+        self._update_generate_button()
+
+    @Slot(str, bool, str)
+    def on_speaker_prepared(self, engine_name: str, fast: bool, voice_path: str):
+        self._prepared_speakers.add((engine_name, fast, voice_path))
+        self._update_generate_button()
+
+    def _update_generate_button(self):
+        """Enable Generate once the selected engine is loaded and, if a voice is selected, warmed up with it."""
+        if self._generating:
+            return
+        key = (self.engine_combo.currentData(), self.fast_mode.isChecked())
+        if key not in self._loaded_engines:
+            self.btn_generate.setEnabled(False)
+            self.btn_generate.setText("Loading engine...")
+        elif self.voice_path and (*key, self.voice_path) not in self._prepared_speakers:
+            self.btn_generate.setEnabled(False)
+            self.btn_generate.setText("Preparing voice...")
+        else:
+            self.btn_generate.setEnabled(True)
+            self.btn_generate.setText("Generate Audio")
 
     def select_voice_file(self):
         file_dialog = QFileDialog(self)
@@ -230,8 +410,16 @@ class VoiceCloningApp(QMainWindow):
                 self.voice_path = files[0]
                 self.voice_label.setText(Path(self.voice_path).name)
                 self.voice_label.setStyleSheet("color: #333;")
+                self._request_speaker()
 
     def start_cloning(self):
+        # While generating, the button stops the current generation
+        if self._generating:
+            self._worker.cancel()
+            self.btn_generate.setEnabled(False)
+            self.btn_generate.setText("Stopping...")
+            return
+
         if not self.voice_path:
             QMessageBox.warning(
                 self,
@@ -245,43 +433,60 @@ class VoiceCloningApp(QMainWindow):
             QMessageBox.warning(self, "Missing Text", "Please enter text to generate audio.")
             return
 
-        # Check if a thread is already running
-        if self.clone_thread and self.clone_thread.isRunning():
-            QMessageBox.warning(self, "Generation In Progress", "Please wait for the current generation to complete.")
-            return
-
         # Disable UI during processing
-        self.btn_generate.setEnabled(False)
-        self.btn_generate.setText("Generating audio...")
+        self.btn_generate.setText("Stop")
         self.btn_play.hide()
         self.btn_save.hide()
         self.btn_select_voice.setEnabled(False)
         self.engine_combo.setEnabled(False)
+        self.fast_mode.setEnabled(False)
 
         # Get selected engine and parameters
         engine_name = self.engine_combo.currentData()
         engine_params = self.engine_controls.get_parameters()
 
-        # Create temporary copy of voice file
+        # Snapshot the voice file as a hard link, reusing the last one while the source is unchanged
         try:
-            temp_voice = Path(tempfile.gettempdir()) / f"voice_{uuid.uuid4().hex}{Path(self.voice_path).suffix}"
-            temp_voice.write_bytes(Path(self.voice_path).read_bytes())
-            self._temp_voice_file = str(temp_voice)
-        except (OSError, PermissionError, MemoryError) as e:
+            stat = os.stat(self.voice_path)
+            voice_stat = (self.voice_path, stat.st_size, stat.st_mtime_ns)
+            if voice_stat != self._voice_stat or not os.path.exists(self._worker_voice):
+                if not os.access(self.voice_path, os.R_OK):
+                    raise PermissionError(f"Permission denied: {self.voice_path}")
+                if self._temp_voice_file:
+                    with contextlib.suppress(OSError):
+                        os.unlink(self._temp_voice_file)
+                    self._temp_voice_file = None
+                temp_voice = Path(tempfile.gettempdir()) / f"voice_{uuid.uuid4().hex}{Path(self.voice_path).suffix}"
+                try:
+                    # Same filesystem: a hard link shares the data, nothing is copied
+                    os.link(self.voice_path, temp_voice)
+                    self._temp_voice_file = str(temp_voice)
+                except OSError:
+                    # Elsewhere the original is read in place; copying it would only cost a full read and write
+                    pass
+                self._worker_voice = self._temp_voice_file or self.voice_path
+                self._voice_stat = voice_stat
+        except (OSError, PermissionError) as e:
             self._reset_ui_state()
             QMessageBox.critical(self, "File Error", f"Cannot read voice file: {e}")
             return
 
-        # Start cloning thread
-        self.clone_thread = CloneThread(
-            text=text, voice_path=str(temp_voice), engine_name=engine_name, engine_params=engine_params
+        # Queue the generation on the worker thread. The previous job has reported back by now,
+        # so any Stop still pending was meant for it.
+        self._generating = True
+        self._worker.reset_cancel()
+        self.clone_requested.emit(
+            text,
+            self._worker_voice,
+            engine_name,
+            self.fast_mode.isChecked(),
+            engine_params,
+            self.play_while_generating.isChecked(),
         )
-        self.clone_thread.finished.connect(self.on_cloning_finished)
-        self.clone_thread.error_occurred.connect(self.on_cloning_error)
-        self.clone_thread.start()
 
     def on_cloning_finished(self, output_path: str, text: str):
         self.current_audio = output_path
+        self._current_audio_data = None
         self._reset_ui_state()
         self.btn_play.show()
         self.btn_save.show()
@@ -293,17 +498,22 @@ class VoiceCloningApp(QMainWindow):
 
     def _reset_ui_state(self):
         """Reset UI to normal state after generation."""
-        self.btn_generate.setEnabled(True)
-        self.btn_generate.setText("Generate Audio")
+        self._generating = False
+        self._update_generate_button()
         self.btn_select_voice.setEnabled(True)
         self.engine_combo.setEnabled(True)
+        self.fast_mode.setEnabled(True)
 
     def play_audio(self):
-        if self.current_audio and Path(self.current_audio).exists():
-            # Stop any currently playing audio first
-            pygame.mixer.music.stop()
-            pygame.mixer.music.load(self.current_audio)
-            pygame.mixer.music.play()
+        if not self.current_audio:
+            return
+        if self._current_audio_data is None:
+            try:
+                self._current_audio_data = sf.read(self.current_audio, dtype="float32")
+            except sf.SoundFileError:
+                return
+        # Non-blocking; replaces any clip that is still playing
+        sd.play(*self._current_audio_data)
 
     def save_audio(self):
         if self.current_audio:
@@ -311,13 +521,12 @@ class VoiceCloningApp(QMainWindow):
                 self, "Save Audio File", f"cloned_voice_{uuid.uuid4().hex[:8]}.wav", "Wave Files (*.wav)"
             )
             if file_path:
-                import shutil
-
                 shutil.copy2(self.current_audio, file_path)
                 QMessageBox.information(self, "Saved", f"Audio file saved to:\n{file_path}")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     app = QApplication(sys.argv)
 
     # Set modern style
@@ -6,7 +6,8 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # The factory imports engines by name at runtime, which PyInstaller's analysis cannot follow
+    hiddenimports=['engines.coqui_engine', 'engines.chatterbox_engine'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],